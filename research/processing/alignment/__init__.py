@@ -61,21 +61,24 @@ __description__ = "Time series alignment with asof-join and exact matching strat
 __author__ = "Node B - The Refinery"
 
 # ====================== RUNTIME VALIDATION ======================
-try:
-    # Test that we can create a default aligner
-    test_result = get_default_aligner()
-    if test_result.is_ok():
-        from ..protocols import TimeSeriesAligner
-        aligner = test_result.unwrap()
-        if not isinstance(aligner, TimeSeriesAligner):
-            import warnings
-            warnings.warn("Default aligner does not comply with TimeSeriesAligner protocol")
-except ImportError:
-    # Silently fail during type checking or if dependencies missing
-    pass
-except Exception as e:
-    import warnings
-    warnings.warn(f"Alignment module validation failed: {e}")
+# Opt-in (STATARB_SELFTEST=1): keeps plain imports free of aligner construction
+import os as _os
+if _os.environ.get("STATARB_SELFTEST"):
+    try:
+        # Test that we can create a default aligner
+        test_result = get_default_aligner()
+        if test_result.is_ok():
+            from ..protocols import TimeSeriesAligner
+            aligner = test_result.unwrap()
+            if not isinstance(aligner, TimeSeriesAligner):
+                import warnings
+                warnings.warn("Default aligner does not comply with TimeSeriesAligner protocol")
+    except ImportError:
+        # Silently fail during type checking or if dependencies missing
+        pass
+    except Exception as e:
+        import warnings
+        warnings.warn(f"Alignment module validation failed: {e}")
 
 # ====================== DOCSTRING FOR MODULE ======================
 """
@@ -4,6 +4,7 @@ Public Facade for Time Series Alignment operations.
 Hides implementation details of strategies behind a simple factory interface.
 """
 import logging
+import os
 from typing import List, Dict, Any, TYPE_CHECKING
 
 # Shared Imports
@@ -173,4 +174,6 @@ def _internal_module_check():
     except Exception as e:
         logger.error(f"Module definition broken: {e}")
 
-_internal_module_check()
+# Opt-in only: importing the package should not build aligners
+if os.environ.get("STATARB_SELFTEST"):
+    _internal_module_check()
@@ -1,22 +1,49 @@
+import re
+import functools
+import numpy as np
 import polars as pl
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Union
 import logging
 
 from ...shared import Result, Ok, Err
 logger = logging.getLogger("AlignmentStrategy")
 
+_TOLERANCE_UNITS_MS = {
+    "ms": 1, "s": 1_000, "m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000
+}
+# Valid Polars units finer than the epoch-ms join key: no exact integer-ms form
+_SUB_MS_UNITS = frozenset(["us", "ns"])
+_TOLERANCE_TOKEN = re.compile(r"(\d+)(ns|us|ms|s|m|h|d|w)")
+
+def _tolerance_to_ms(tolerance: str) -> Optional[int]:
+    """
+    Parse a Polars-style duration ("1m", "500ms", "1h30m", "1w") into epoch milliseconds.
+    Returns None for sub-ms units ("1us", "500ns"): the caller joins on Datetime[ms]
+    keys with the string tolerance instead, exactly as Polars resolves it.
+    """
+    tokens = _TOLERANCE_TOKEN.findall(tolerance)
+    if not tokens or "".join(v + u for v, u in tokens) != tolerance:
+        raise ValueError(f"Unsupported tolerance format: '{tolerance}'")
+    if any(u in _SUB_MS_UNITS for _, u in tokens):
+        return None
+    return sum(int(v) * _TOLERANCE_UNITS_MS[u] for v, u in tokens)
+
 class HybridAsofAligner:
     """
     Smart Zipper Aligner with Strict Trap Prevention.
     Implements TimeSeriesAligner protocol using Polars 'join_asof'.
     
     Trap Prevention:
-    1. Unix vs Datetime: We convert EVERYTHING to pl.Datetime("ms").
-       Why? Because Polars join_asof requires Datetime dtype to use string tolerances like "1m".
-    2. Double Casting: Single cast at beginning.
+    1. Unix vs Datetime: Joins run on Int64 epoch-ms keys with a numeric tolerance
+       (parsed from strings like "1m"); pl.Datetime("ms") is built ONCE on the aligned output.
+       Sub-ms tolerances ("1us") keep the Datetime[ms] join with the string tolerance.
+    2. Double Casting: Single cast at beginning, single cast at the end.
     3. Null Explosion: Configurable null handling (drop or fill).
     """
 
+    _ENGINES = ("join_asof", "asof_by", "searchsorted")
+
     def __init__(self, tolerance: str = '1m', strategy: str = 'backward'):
         self.tolerance = tolerance
         self.strategy = strategy
@@ -27,9 +54,9 @@ class HybridAsofAligner:
         if self.strategy not in valid_strategies:
             raise ValueError(f"Invalid strategy: {self.strategy}. Must be {valid_strategies}")
 
-        valid_suffixes = ("ms", "s", "m", "h", "d")
-        if not self.tolerance.endswith(valid_suffixes):
-            logger.warning(f"Tolerance format '{self.tolerance}' might be invalid for Polars.")
+        # Parse once: joins use a numeric Int64 tolerance (None -> Datetime/string join)
+        self._tol_ms: Optional[int] = _tolerance_to_ms(self.tolerance)
+        self._join_tol: Union[int, str] = self.tolerance if self._tol_ms is None else self._tol_ms
 
     @property
     def method(self) -> str:
@@ -46,18 +73,36 @@ class HybridAsofAligner:
                 return Err("No data provided for alignment")
 
             symbols = list(data_map.keys())
-            logger.info(f"Start alignment for {len(symbols)} symbols: {symbols}")
+            logger.info("Start alignment for %d symbols: %s", len(symbols), symbols)
 
             # --- 2. CONFIGURATION ---
             strict_mode = kwargs.get("strict", True)
             anchor_symbol = kwargs.get("anchor", symbols[0])
             suffix_format = kwargs.get("suffix", "_{symbol}")
+            # Materialize each follower before joining so the lazy plan stays
+            # flat (chained LazyFrame joins blow up optimizer time beyond ~6 symbols).
+            eager_followers = kwargs.get("eager_followers", True)
+            join_engine = kwargs.get("join_engine", "join_asof")
+            # Drop unmatched rows after EACH join so later joins probe a smaller left side
+            incremental_strict = (
+                strict_mode
+                and kwargs.get("incremental_strict", False)
+                and join_engine == "join_asof"
+            )
+
+            if join_engine not in self._ENGINES:
+                return Err(f"Invalid join_engine: '{join_engine}'. Must be one of {list(self._ENGINES)}")
 
             if anchor_symbol not in data_map:
                 return Err(f"Anchor symbol '{anchor_symbol}' not found in data map")
 
+            # Fail fast on ANY bad frame before paying for a single join
+            validation_res = self._validate_all(data_map)
+            if validation_res.is_err():
+                return validation_res
+
             # --- 3. PREPARE ANCHOR (BASE) ---
-            logger.info(f"Setting Anchor: {anchor_symbol}")
+            logger.info("Setting Anchor: %s", anchor_symbol)
             
             anchor_res = self._prepare_frame(
                 data_map[anchor_symbol], 
@@ -69,30 +114,88 @@ class HybridAsofAligner:
                 return Err(f"Anchor prep failed: {anchor_res.error}")
                 
             lf_aligned = anchor_res.unwrap()
+            if incremental_strict:
+                lf_aligned = lf_aligned.drop_nulls()
+            tol_ms = self._tol_ms
+            if tol_ms is None and join_engine == "searchsorted":
+                # The sorted-merge gap test needs an integer-ms tolerance
+                logger.debug("Sub-ms tolerance '%s': using join_asof engine", self.tolerance)
+                join_engine = "join_asof"
 
             # --- 4. JOIN FOLLOWERS ---
-            for sym in symbols:
-                if sym == anchor_symbol:
-                    continue
-                
-                follower_res = self._prepare_frame(data_map[sym], sym, suffix_format)
-                if follower_res.is_err():
-                    logger.warning(f"Skipping {sym}: {follower_res.error}")
-                    continue
-                
-                lf_follower = follower_res.unwrap()
-
-                # Execute JOIN_ASOF (The Magic)
-                # Requirement: Join Key MUST be sorted AND Datetime type (for string tolerance)
-                lf_aligned = lf_aligned.join_asof(
-                    lf_follower,
-                    on="timestamp",
-                    strategy=self.strategy,
-                    tolerance=self.tolerance
+            if join_engine == "asof_by":
+                # Single stacked join_asof(by=symbol) instead of one join per follower
+                lf_aligned = self._align_single_asof_by(
+                    lf_aligned, data_map, anchor_symbol, suffix_format, self._join_tol
+                )
+            elif join_engine == "searchsorted":
+                # Eager sorted-merge: one np.searchsorted pass per follower, no join nodes
+                lf_aligned = self._align_searchsorted(
+                    lf_aligned, data_map, anchor_symbol, suffix_format, tol_ms
                 )
+            else:
+                followers: List[pl.LazyFrame] = []
+                for sym in symbols:
+                    if sym == anchor_symbol:
+                        continue
+                
+                    follower_res = self._prepare_frame(data_map[sym], sym, suffix_format)
+                    if follower_res.is_err():
+                        logger.warning(f"Skipping {sym}: {follower_res.error}")
+                        continue
+                    followers.append(follower_res.unwrap())
+
+                if eager_followers and followers:
+                    # One batched collect: anchor + follower plans execute in parallel
+                    df_anchor, *df_followers = pl.collect_all([lf_aligned] + followers)
+                    col_order = df_anchor.columns + [
+                        c for df in df_followers for c in df.columns if c != "timestamp"
+                    ]
+
+                    # Identical-grid fast path: a follower sampled on exactly the anchor's
+                    # timestamps matches row-for-row, so it is stitched without any search.
+                    anchor_ts = df_anchor["timestamp"]
+                    on_grid = [df["timestamp"].equals(anchor_ts) for df in df_followers]
+                    grid_frames = [df.drop("timestamp") for df, hit in zip(df_followers, on_grid) if hit]
+
+                    lf_aligned = pl.concat([df_anchor, *grid_frames], how="horizontal").lazy()
+                    if incremental_strict and grid_frames:
+                        lf_aligned = lf_aligned.drop_nulls(
+                            subset=[c for df in grid_frames for c in df.columns]
+                        )
+                    followers = [df.lazy() for df, hit in zip(df_followers, on_grid) if not hit]
+                else:
+                    col_order = None
+
+                if followers:
+                    lf_aligned = self._join_keys(lf_aligned)
+                for lf_follower in followers:
+                    # Execute JOIN_ASOF (The Magic)
+                    # Requirement: Join Key MUST be sorted (Int64 epoch-ms, numeric tolerance).
+                    # Both sides are set_sorted by _standardize_timestamp, so the
+                    # per-join sortedness re-check is skipped.
+                    lf_aligned = lf_aligned.join_asof(
+                        self._join_keys(lf_follower),
+                        on="timestamp",
+                        strategy=self.strategy,
+                        tolerance=self._join_tol,
+                        check_sortedness=False
+                    )
+                    if incremental_strict:
+                        follower_cols = [
+                            c for c in lf_follower.collect_schema().names() if c != "timestamp"
+                        ]
+                        lf_aligned = lf_aligned.drop_nulls(subset=follower_cols)
+
+                if col_order is not None:
+                    # Grid followers were stitched first; restore symbol column order
+                    lf_aligned = lf_aligned.select(col_order)
+
+            # Derived Datetime column is computed once, on the aligned frame only
+            lf_aligned = lf_aligned.with_columns(pl.col("timestamp").cast(pl.Datetime("ms")))
 
             # --- 5. CLEANUP ---
-            if strict_mode:
+            if strict_mode and not incremental_strict:
                 lf_aligned = lf_aligned.drop_nulls()
 
             lf_aligned = self._add_metadata(lf_aligned, symbols, anchor_symbol)
@@ -106,6 +209,33 @@ class HybridAsofAligner:
 
     # ========| PRIVATE HELPERS |========
 
+    def _validate_all(self, data_map: Dict[str, pl.LazyFrame]) -> Result[None, str]:
+        """
+        Validate every frame concurrently (schema resolution releases the GIL).
+        All failures are aggregated into a single Err.
+        """
+        with ThreadPoolExecutor(max_workers=min(16, len(data_map))) as pool:
+            errors = [
+                err for err in pool.map(self._validate_frame, data_map.keys(), data_map.values())
+                if err is not None
+            ]
+
+        if errors:
+            return Err(f"Invalid input frames: {'; '.join(errors)}")
+        return Ok(None)
+
+    @staticmethod
+    def _validate_frame(symbol: str, lf: pl.LazyFrame) -> Optional[str]:
+        """Returns an error message for an unusable frame, None otherwise."""
+        if not isinstance(lf, (pl.LazyFrame, pl.DataFrame)):
+            return f"{symbol}: not a Polars frame (Got: {type(lf).__name__})"
+        try:
+            if "timestamp" not in lf.collect_schema().names():
+                return f"{symbol}: missing 'timestamp' column"
+        except Exception as e:
+            return f"{symbol}: schema resolution failed ({e})"
+        return None
+
     def _prepare_frame(
         self, 
         lf: pl.LazyFrame, 
@@ -114,38 +244,167 @@ class HybridAsofAligner:
     ) -> Result[pl.LazyFrame, str]:
         """Standardize Timestamp & Rename Columns."""
         try:
+            # Schema di-resolve sekali per frame, dipakai ulang oleh semua langkah di bawah
+            schema = lf.collect_schema()
+
             # 1. Standardize Timestamp (Datetime & Sorted)
-            lf = self._standardize_timestamp(lf, symbol)
+            lf = self._standardize_timestamp(lf, symbol, schema)
             
             # 2. Rename Columns (Suffixing)
             suffix = suffix_fmt.format(symbol=symbol)
             
-            # Rename all except timestamp
-            cols_to_rename = [c for c in lf.collect_schema().names() if c != "timestamp"]
-            lf = lf.rename({c: f"{c}{suffix}" for c in cols_to_rename})
+            # Rename all except timestamp (standardization keeps the column set intact)
+            lf = lf.rename({c: f"{c}{suffix}" for c in schema if c != "timestamp"})
             
             return Ok(lf)
         except Exception as e:
             return Err(f"Frame prep error for {symbol}: {e}")
 
-    def _standardize_timestamp(self, lf: pl.LazyFrame, symbol: str) -> pl.LazyFrame:
+    def _align_single_asof_by(
+        self,
+        lf_anchor: pl.LazyFrame,
+        data_map: Dict[str, pl.LazyFrame],
+        anchor_symbol: str,
+        suffix_fmt: str,
+        tolerance: Union[int, str]
+    ) -> pl.LazyFrame:
+        """
+        Batched alignment: one join_asof(by=symbol) over all followers.
+        1. Stack followers into one long frame tagged with '__symbol'.
+        2. Repeat every anchor row once per follower symbol.
+        3. Single asof join, then fold back to wide (one row per anchor timestamp).
+        """
+        followers: Dict[str, List[str]] = {}
+        frames: List[pl.LazyFrame] = []
+        for sym, lf in data_map.items():
+            if sym == anchor_symbol:
+                continue
+            try:
+                schema = lf.collect_schema()
+                lf_std = self._standardize_timestamp(lf, sym, schema)
+            except Exception as e:
+                logger.warning(f"Skipping {sym}: {e}")
+                continue
+            followers[sym] = [c for c in schema.names() if c != "timestamp"]
+            frames.append(lf_std.with_columns(pl.lit(sym).alias("__symbol")))
+
+        if not frames:
+            return lf_anchor
+
+        long_followers = self._join_keys(pl.concat(frames, how="diagonal_relaxed").sort("timestamp"))
+        anchor_cols = [c for c in lf_anchor.collect_schema().names() if c != "timestamp"]
+
+        lf_keys = self._join_keys(
+            lf_anchor
+            .join(pl.LazyFrame({"__symbol": list(followers)}), how="cross")
+            .sort("timestamp")
+        )
+        lf_long = lf_keys.join_asof(
+            long_followers,
+            on="timestamp",
+            by="__symbol",
+            strategy=self.strategy,
+            tolerance=tolerance,
+            check_sortedness=False
+        )
+
+        # Fold long -> wide, suffixing each follower's columns
+        aggs = [pl.col(c).first() for c in anchor_cols]
+        for sym, cols in followers.items():
+            suffix = suffix_fmt.format(symbol=sym)
+            is_sym = pl.col("__symbol") == sym
+            aggs.extend(pl.col(c).filter(is_sym).first().alias(f"{c}{suffix}") for c in cols)
+
+        return lf_long.group_by("timestamp", maintain_order=True).agg(aggs)
+
+    def _align_searchsorted(
+        self,
+        lf_anchor: pl.LazyFrame,
+        data_map: Dict[str, pl.LazyFrame],
+        anchor_symbol: str,
+        suffix_fmt: str,
+        tol_ms: int
+    ) -> pl.LazyFrame:
+        """
+        Eager multi-way merge driven by the sorted anchor timestamps.
+        For every follower: np.searchsorted -> match index -> tolerance mask -> gather.
+        All frames are collected in one batch and stitched horizontally.
+        """
+        prepared: List[pl.LazyFrame] = []
+        for sym, lf in data_map.items():
+            if sym == anchor_symbol:
+                continue
+            follower_res = self._prepare_frame(lf, sym, suffix_fmt)
+            if follower_res.is_err():
+                logger.warning(f"Skipping {sym}: {follower_res.error}")
+                continue
+            prepared.append(follower_res.unwrap())
+
+        df_anchor, *df_followers = pl.collect_all([lf_anchor] + prepared)
+        anchor_ts = df_anchor["timestamp"].to_numpy()
+
+        gathered = [df_anchor]
+        for df in df_followers:
+            follower_ts = df["timestamp"].to_numpy()
+            if follower_ts.size == 0:
+                gathered.append(df.drop("timestamp").clear(n=df_anchor.height))
+                continue
+            if self.strategy == "backward":
+                idx = np.searchsorted(follower_ts, anchor_ts, side="right") - 1
+                valid = idx >= 0
+                gap = anchor_ts - follower_ts[np.clip(idx, 0, None)]
+            else:  # forward
+                idx = np.searchsorted(follower_ts, anchor_ts, side="left")
+                valid = idx < len(follower_ts)
+                gap = follower_ts[np.clip(idx, None, len(follower_ts) - 1)] - anchor_ts
+            valid &= gap <= tol_ms
+
+            # Null index -> null row, same as an unmatched join_asof
+            take = pl.Series(idx, dtype=pl.Int64).set(pl.Series(~valid), None)
+            gathered.append(df.drop("timestamp").gather(take))
+
+        return pl.concat(gathered, how="horizontal").lazy()
+
+    def _join_keys(self, lf: pl.LazyFrame) -> pl.LazyFrame:
+        """Sub-ms tolerance only: join keys become Datetime[ms] so Polars parses the string."""
+        if self._tol_ms is not None:
+            return lf
+        return lf.with_columns(pl.col("timestamp").cast(pl.Datetime("ms")))
+
+    def _standardize_timestamp(
+        self,
+        lf: Union[pl.LazyFrame, pl.DataFrame],
+        symbol: str,
+        schema: Optional[pl.Schema] = None
+    ) -> pl.LazyFrame:
         """
         Trap Prevention Core:
-        1. Cast 'timestamp' to Datetime[ms]. (FIXED from Int64)
-        2. Sort by 'timestamp'.
-        3. Deduplicate.
+        0. DataFrame input becomes lazy here, once (collect_all/join_asof need LazyFrames).
+        1. Cast 'timestamp' to Int64 epoch-ms (Datetime is rebuilt after the join).
+        2. Deduplicate (keep last row per timestamp).
+        3. Sort by 'timestamp' and flag it sorted.
+
+        Pass a pre-resolved `schema` to avoid walking the lazy plan twice.
         """
-        if "timestamp" not in lf.collect_schema().names():
+        lf = lf.lazy()
+        if schema is None:
+            schema = lf.collect_schema()
+        if "timestamp" not in schema:
              raise ValueError(f"Symbol {symbol} missing 'timestamp' column")
 
+        # Skip no-op cast: Int64 input already matches the join key dtype
+        if schema["timestamp"] != pl.Int64:
+            lf = lf.with_columns([
+                pl.col("timestamp").cast(pl.Int64).alias("timestamp")
+            ])
+
         return (
             lf
-            .with_columns([
-                # CRITICAL FIX: Cast Int64 -> Datetime[ms] agar kompatibel dengan tolerance="1m"
-                pl.col("timestamp").cast(pl.Int64).cast(pl.Datetime("ms")).alias("timestamp")
-            ])
-            .sort("timestamp")
+            # Hash dedup first: the sort only sees distinct timestamps
             .unique(subset=["timestamp"], keep="last")
+            .sort("timestamp")
+            # Flag for the sorted-merge fast path
+            .set_sorted("timestamp")
         )
 
     def _add_metadata(self, lf: pl.LazyFrame, symbols: List[str], anchor: str) -> pl.LazyFrame:
@@ -170,13 +429,28 @@ class ExactTimeAligner:
                 return Err("No data provided")
 
             symbols = list(data_map.keys())
-            anchor_sym = symbols[0]
-            lf_result = self._standardize(data_map[anchor_sym], anchor_sym)
+            frames = [self._standardize(data_map[sym], sym) for sym in symbols]
+            output_cols = ["timestamp"] + [
+                c for lf in frames for c in lf.collect_schema().names() if c != "timestamp"
+            ]
 
-            for sym in symbols[1:]:
-                lf_other = self._standardize(data_map[sym], sym)
-                lf_result = lf_result.join(lf_other, on="timestamp", how="inner")
+            # Join order heuristic: smallest frame first keeps every intermediate small.
+            # Row counts come from one batched eager probe on the raw inputs.
+            row_counts = [
+                df.item() for df in pl.collect_all(
+                    [data_map[sym].lazy().select(pl.len()) for sym in symbols]
+                )
+            ]
+            frames = [lf for _, lf in sorted(zip(row_counts, frames), key=lambda pair: pair[0])]
+
+            # Sorted Int64 keys + explicit coalesce: one shared timestamp column per join
+            lf_result = functools.reduce(
+                lambda left, right: left.join(right, on="timestamp", how="inner", coalesce=True),
+                frames
+            ).select(output_cols)
 
+            # Join on Int64 keys, build the Datetime column once on the result
+            lf_result = lf_result.with_columns(pl.col("timestamp").cast(pl.Datetime("ms")))
             return Ok(lf_result)
 
         except Exception as e:
@@ -184,14 +458,14 @@ class ExactTimeAligner:
 
     def _standardize(self, lf: pl.LazyFrame, symbol: str) -> pl.LazyFrame:
         suffix = f"_{symbol}"
-        cols = [c for c in lf.collect_schema().names() if c != "timestamp"]
-        rename_map = {c: f"{c}{suffix}" for c in cols}
+        rename_map = {c: f"{c}{suffix}" for c in lf.collect_schema() if c != "timestamp"}
         
         return (
             lf
-            .with_columns(pl.col("timestamp").cast(pl.Int64).cast(pl.Datetime("ms")))
+            .with_columns(pl.col("timestamp").cast(pl.Int64))
+            .unique(subset=["timestamp"], keep="last")
             .sort("timestamp")
-            .unique(subset=["timestamp"])
+            .set_sorted("timestamp")
             .rename(rename_map)
         )
 
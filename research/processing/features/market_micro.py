@@ -2,11 +2,12 @@
 MICROSTRUCTURE FEATURES MODULE (TIER 2)
 Focus: Market Risk Sensors (Rolling Volatility & Correlation).
 Location: research/processing/features/market_micro.py
-Compatibility: Polars 1.x+
+Optimization: Row-based rolling (The 'KOTOR' way) for Polars 1.x stability.
 """
+import functools
 import logging
 import polars as pl
-from typing import List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 # Type-safe imports
 from typing import TYPE_CHECKING
@@ -17,268 +18,414 @@ from ...shared import Ok, Err
 
 logger = logging.getLogger("MicrostructureTransformer")
 
+# Optional JIT backend (numba tidak wajib; fallback ke Polars rolling_*)
+try:
+    import numpy as np
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+if _HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _rolling_std_batch(x, w, min_periods, out):
+        """Sliding Welford std (ddof=1) for every column of x (N, K). NaN = missing."""
+        n_rows, n_cols = x.shape
+        for k in prange(n_cols):
+            n = 0
+            mean = 0.0
+            m2 = 0.0
+            for i in range(n_rows):
+                v = x[i, k]
+                if not np.isnan(v):
+                    n += 1
+                    d = v - mean
+                    mean += d / n
+                    m2 += d * (v - mean)
+                if i >= w:
+                    old = x[i - w, k]
+                    if not np.isnan(old):
+                        n -= 1
+                        if n == 0:
+                            mean = 0.0
+                            m2 = 0.0
+                        else:
+                            d = old - mean
+                            mean -= d / n
+                            m2 -= d * (old - mean)
+                if n >= min_periods and n >= 2 and m2 > 0.0:
+                    out[i, k] = np.sqrt(m2 / (n - 1))
+                else:
+                    out[i, k] = 0.0
+
+    @njit(parallel=True, cache=True)
+    def _rolling_corr_batch(x, a, w, min_periods, out):
+        """Sliding pairwise corr of every column of x (N, K) against a (N,). NaN = missing."""
+        n_rows, n_cols = x.shape
+        for k in prange(n_cols):
+            n = 0
+            mx = 0.0
+            ma = 0.0
+            sxx = 0.0
+            saa = 0.0
+            sxa = 0.0
+            for i in range(n_rows):
+                v = x[i, k]
+                u = a[i]
+                if not (np.isnan(v) or np.isnan(u)):
+                    n += 1
+                    dx = v - mx
+                    da = u - ma
+                    mx += dx / n
+                    ma += da / n
+                    sxx += dx * (v - mx)
+                    saa += da * (u - ma)
+                    sxa += dx * (u - ma)
+                if i >= w:
+                    ov = x[i - w, k]
+                    ou = a[i - w]
+                    if not (np.isnan(ov) or np.isnan(ou)):
+                        n -= 1
+                        if n == 0:
+                            mx = ma = sxx = saa = sxa = 0.0
+                        else:
+                            dx = ov - mx
+                            da = ou - ma
+                            mx -= dx / n
+                            ma -= da / n
+                            sxx -= dx * (ov - mx)
+                            saa -= da * (ou - ma)
+                            sxa -= dx * (ou - ma)
+                denom = np.sqrt(sxx * saa)
+                if n >= min_periods and n >= 2 and denom > 0.0:
+                    out[i, k] = sxa / denom
+                else:
+                    out[i, k] = 0.0
+
 class MicrostructureTransformer:
     """
     Tier 2 Transformer: Computes Rolling Volatility and Correlation.
     
-    Logic:
-    1. Volatility: Uses .rolling(index_column=...).std()
-    2. Correlation: Uses .rolling(index_column=...).corr(other)
-    
-    Polars 1.x Compliance:
-    - Removes 'by' argument (replaced by index_column).
-    - Removes 'rolling_std' (replaced by expression chaining).
-    - Enforces Datetime type for timestamp column.
+    ENGINEERING HACK:
+    Uses row-count based rolling (window_size=int) instead of time-based.
+    Assumes data is aligned to 1m intervals by the previous stage.
+
+    Optional numba backend (use_numba=True): one JIT pass per window over an
+    (N, K) return matrix, executed lazily via map_batches.
+
+    Optional moments backend (use_moments=True): x, x^2 and x*anchor are computed
+    ONCE as helper columns; every window then only needs rolling_sum differences.
+
+    Hybrid (numba_corr_min_rows=N): rolling std is memory-bound and stays on Polars;
+    correlation over windows of >= N rows is compute-bound and goes to the JIT kernel.
     """
 
+    # Pipeline hint: reads only upstream columns, appends new ones, keeps rows
+    independent = True
+
     def __init__(
         self,
         windows: Optional[List[str]] = None,
         anchor_symbol: str = "BTC",
-        closed: str = "right"
+        min_periods: int = 1,
+        use_numba: bool = False,
+        use_moments: bool = False,
+        numba_corr_min_rows: Optional[int] = None
     ):
         """
         Args:
-            windows: Time windows (e.g., ["1h", "4h", "24h"]).
-            anchor_symbol: Reference asset for correlation (default: BTC).
-            closed: Window boundary ('left', 'right', 'both', 'none').
+            windows: Time windows (e.g., ["1h", "4h"]). 
+            anchor_symbol: Reference asset for correlation.
+            min_periods: Minimum observations for valid result.
+            use_numba: Use the JIT kernels when numba is installed (falls back to Polars).
+            use_moments: Shared x/x^2/x*anchor helper columns + rolling_sum per window.
+            numba_corr_min_rows: Route corr of windows with at least this many rows
+                to the JIT kernel (None = off; requires numba).
         """
         self.windows = windows or ["1h", "4h", "24h"]
         self.anchor_symbol = anchor_symbol
-        self.closed = closed
-        
-        valid_closed = ["left", "right", "both", "none"]
-        if closed not in valid_closed:
-            raise ValueError(f"closed must be one of {valid_closed}, got {closed}")
+        self.min_periods = min_periods
+        # Window strings resolved to row counts once, not on every transform()
+        self._window_rows: List[Tuple[str, int]] = [
+            (w, self._parse_window_to_rows(w)) for w in self.windows
+        ]
+        # Expression lists keyed by the ret_* column layout (order matters: it fixes output order)
+        self._expr_cache: Dict[Tuple[str, ...], List[pl.Expr]] = {}
+        self.use_numba = use_numba and _HAS_NUMBA
+        self.use_moments = use_moments
+        self.numba_corr_min_rows = numba_corr_min_rows if _HAS_NUMBA else None
+
+        if use_numba and not _HAS_NUMBA:
+            logger.warning("numba not installed. Falling back to Polars rolling backend.")
+
+    @property
+    def config_hash(self) -> int:
+        """Hash of the constructor params (pipeline result-cache key)."""
+        return hash((
+            type(self).__name__, tuple(self.windows), self.anchor_symbol, self.min_periods,
+            self.use_numba, self.use_moments, self.numba_corr_min_rows,
+        ))
 
     def transform(
         self, 
         data: pl.LazyFrame, 
         **kwargs: Any
     ) -> 'Result[pl.LazyFrame, str]':
-        """
-        Executes Tier 2 Transformation.
-        """
         try:
             # 1. Schema Inspection
-            schema = data.collect_schema()
-            schema_cols = schema.names()
-            
-            # 2. Validate prerequisites
-            if "timestamp" not in schema_cols:
-                return Err("Missing required 'timestamp' column for rolling calculations")
-            
-            # 3. POLARS 1.x CRITICAL: Ensure Timestamp is Datetime
-            # Dynamic rolling (period="1h") requires Datetime, not Int64.
-            ts_type = schema["timestamp"]
-            # Cek jika tipe datanya bukan Datetime (misal Int64)
-            if not isinstance(ts_type, pl.Datetime):
-                logger.debug(f"Casting timestamp from {ts_type} to Datetime for rolling ops")
-                # Asumsi input Int64 adalah Unix Milliseconds (standar CCXT/Crypto)
-                data = data.with_columns(
-                    pl.col("timestamp").cast(pl.Datetime("ms")).alias("timestamp")
-                )
+            schema_cols = data.collect_schema().names()
             
-            # 4. Find return columns
+            # 2. Find return columns (ret_*)
             ret_cols = [c for c in schema_cols if c.startswith("ret_")]
             if not ret_cols:
-                return Err("Tier 2 Error: No 'ret_*' columns found. Run Tier 1 (Returns) first.")
+                return Err("Tier 2 Error: No 'ret_*' columns found.")
 
-            # 5. Check Anchor
+            # 3. Check Anchor
             anchor_col = f"ret_{self.anchor_symbol}"
             has_anchor = anchor_col in ret_cols
             
             if not has_anchor:
-                logger.warning(
-                    f"Anchor '{self.anchor_symbol}' not found in returns. "
-                    "Correlation features will be skipped."
-                )
+                logger.warning(f"Anchor '{self.anchor_symbol}' missing. Skipping correlation.")
+            # Correlation targets resolved once; builders never re-check the anchor
+            targets = [c for c in ret_cols if c != anchor_col] if has_anchor else []
 
-            logger.debug(f"Computing Microstructure Features. Windows: {self.windows}")
+            if self.use_numba:
+                return Ok(self._transform_numba(data, ret_cols, anchor_col, targets))
 
-            # 6. Build Expressions
-            expressions = self._build_expressions(ret_cols, anchor_col, has_anchor)
+            if self.use_moments:
+                return Ok(self._transform_moments(data, ret_cols, anchor_col, targets))
 
-            # 7. Execute (Lazy)
-            transformed_lf = data.with_columns(expressions)
-            
-            return Ok(transformed_lf)
+            # Compute-bound corr windows (large row counts) -> JIT kernel
+            jit_corr_windows = []
+            if self.numba_corr_min_rows is not None and targets:
+                jit_corr_windows = [
+                    (w, n) for w, n in self._window_rows if n >= self.numba_corr_min_rows
+                ]
+
+            # 4. Build Expressions (memoized per ret_* column layout)
+            key = tuple(ret_cols)
+            expressions = self._expr_cache.get(key)
+            if expressions is None:
+                expressions = self._build_expressions(
+                    ret_cols, anchor_col, targets,
+                    skip_corr={w for w, _ in jit_corr_windows}
+                )
+                self._expr_cache[key] = expressions
+
+            # 5. Execute
+            lf = data.with_columns(expressions)
+            if jit_corr_windows:
+                lf = self._transform_numba(
+                    lf, ret_cols, anchor_col, targets,
+                    windows=jit_corr_windows, include_vol=False
+                )
+                # Restore the canonical feature order (vol/corr per window)
+                lf = lf.select(
+                    schema_cols + self._feature_names(ret_cols, targets, self._window_rows)
+                )
+            return Ok(lf)
 
         except Exception as e:
             logger.error(f"Microstructure Calculation Failed: {e}", exc_info=True)
             return Err(f"Tier 2 Error: {str(e)}")
 
+    def preview_schema(self, schema: Dict[str, Any]) -> 'Result[Dict[str, Any], str]':
+        """
+        Output schema of transform() for an input {column: dtype}, without a plan.
+        Features are Float64 (Tier 1 emits Float64 returns; numba/moments always do).
+        """
+        ret_cols = [c for c in schema if c.startswith("ret_")]
+        if not ret_cols:
+            return Err("Tier 2 Error: No 'ret_*' columns found.")
+
+        anchor_col = f"ret_{self.anchor_symbol}"
+        targets = [c for c in ret_cols if c != anchor_col] if anchor_col in ret_cols else []
+        out = dict(schema)
+        for name in self._feature_names(ret_cols, targets, self._window_rows):
+            out[name] = pl.Float64
+        return Ok(out)
+
     def _build_expressions(
-        self, 
-        ret_cols: List[str], 
-        anchor_col: str, 
-        has_anchor: bool
+        self,
+        ret_cols: List[str],
+        anchor_col: str,
+        targets: List[str],
+        skip_corr: Optional[set] = None
     ) -> List[pl.Expr]:
-        """Build expressions using Polars 1.x Syntax."""
+        """
+        One batched expression per window & feature (vol for all, corr vs anchor).
+        Expressions are emitted in contiguous per-window blocks (vol, then corr) so
+        rolling work over the same window size sits together in the plan.
+        Windows listed in `skip_corr` get no corr expression (computed elsewhere).
+        """
+        skip_corr = skip_corr or set()
         expressions = []
         
-        for window in self.windows:
+        # "1h" -> 60, "1d" -> 1440 (pre-parsed in __init__)
+        for window_str, n_rows in self._window_rows:
+            
             # A. ROLLING VOLATILITY
-            for ret_col in ret_cols:
-                asset_name = ret_col.replace("ret_", "")
-                feat_name = f"vol_{asset_name}_{window}"
-                
-                # SYNTAX 1.x: .rolling(...).std()
-                vol_expr = (
-                    pl.col(ret_col)
-                    .rolling(
-                        period=window, 
-                        index_column="timestamp", 
-                        closed=self.closed
+            # Row-based rolling std (Ultra Stable API)
+            vol_expr = (
+                pl.col(ret_cols)
+                .rolling_std(window_size=n_rows, min_periods=self.min_periods)
+                .fill_nan(0.0)
+                .fill_null(0.0)
+                .name.map(lambda c, w=window_str: f"vol_{c.replace('ret_', '')}_{w}")
+            )
+            expressions.append(vol_expr)
+            
+            # B. ROLLING CORRELATION
+            if targets and window_str not in skip_corr:
+                # Row-based rolling corr (Top-level function for max stability)
+                corr_expr = (
+                    pl.rolling_corr(
+                        pl.col(targets),
+                        pl.col(anchor_col),
+                        window_size=n_rows,
+                        min_periods=self.min_periods
                     )
-                    .std()
                     .fill_nan(0.0)
                     .fill_null(0.0)
-                    .alias(feat_name)
-                )
-                expressions.append(vol_expr)
-            
-            # B. ROLLING CORRELATION
-            if has_anchor:
-                for ret_col in ret_cols:
-                    if ret_col == anchor_col: continue 
-                    
-                    asset_name = ret_col.replace("ret_", "")
-                    feat_name = f"corr_{asset_name}_{self.anchor_symbol}_{window}"
-                    
-                    # SYNTAX 1.x: .rolling(...).corr(other)
-                    corr_expr = (
-                        pl.col(ret_col)
-                        .rolling(
-                            period=window, 
-                            index_column="timestamp", 
-                            closed=self.closed
-                        )
-                        .corr(pl.col(anchor_col))
-                        .fill_nan(0.0)
-                        .fill_null(0.0)
-                        .alias(feat_name)
+                    .name.map(
+                        lambda c, w=window_str: f"corr_{c.replace('ret_', '')}_{self.anchor_symbol}_{w}"
                     )
-                    expressions.append(corr_expr)
-        
+                )
+                expressions.append(corr_expr)
+
         return expressions
 
-"""
-MICROSTRUCTURE FEATURES MODULE (TIER 2)
-Focus: Market Risk Sensors (Rolling Volatility & Correlation).
-Location: research/processing/features/market_micro.py
-Optimization: Row-based rolling (The 'KOTOR' way) for Polars 1.x stability.
-"""
-import logging
-import polars as pl
-from typing import List, Any, Optional
+    def collect_streaming(self, lf: pl.LazyFrame) -> pl.DataFrame:
+        """Materialize a transform() result with the streaming engine (lower peak RSS)."""
+        return lf.collect(engine="streaming")
 
-# Type-safe imports
-from typing import TYPE_CHECKING
-if TYPE_CHECKING:
-    from ...shared import Result
+    def _transform_numba(
+        self,
+        data: pl.LazyFrame,
+        ret_cols: List[str],
+        anchor_col: str,
+        targets: List[str],
+        windows: Optional[List[Tuple[str, int]]] = None,
+        include_vol: bool = True
+    ) -> pl.LazyFrame:
+        """Same features & column order as the Polars path, computed by the JIT kernels."""
+        windows = self._window_rows if windows is None else windows
+        feat_names = self._feature_names(ret_cols, targets, windows, include_vol)
 
+        def _compute(df: pl.DataFrame) -> pl.DataFrame:
+            # Null -> NaN so the kernels can skip missing rows
+            x = np.asfortranarray(
+                df.select(pl.col(ret_cols).cast(pl.Float64).fill_null(float("nan"))).to_numpy()
+            )
+            a = x[:, ret_cols.index(anchor_col)].copy() if targets else None
+            x_t = np.asfortranarray(x[:, [ret_cols.index(c) for c in targets]]) if targets else None
 
-logger = logging.getLogger("MicrostructureTransformer")
+            outputs = []
+            for _, n_rows in windows:
+                if include_vol:
+                    vol = np.empty_like(x)
+                    _rolling_std_batch(x, n_rows, self.min_periods, vol)
+                    outputs.append(vol)
+                if targets:
+                    corr = np.empty_like(x_t)
+                    _rolling_corr_batch(x_t, a, n_rows, self.min_periods, corr)
+                    outputs.append(corr)
 
-class MicrostructureTransformer:
-    """
-    Tier 2 Transformer: Computes Rolling Volatility and Correlation.
-    
-    ENGINEERING HACK:
-    Uses row-count based rolling (window_size=int) instead of time-based.
-    Assumes data is aligned to 1m intervals by the previous stage.
-    """
+            feats = pl.DataFrame(np.hstack(outputs), schema=feat_names, orient="row")
+            return df.hstack(feats)
 
-    def __init__(
+        out_schema = pl.Schema(
+            list(data.collect_schema().items()) + [(name, pl.Float64) for name in feat_names]
+        )
+        return data.map_batches(_compute, schema=out_schema, streamable=False)
+
+    def _feature_names(
         self,
-        windows: Optional[List[str]] = None,
-        anchor_symbol: str = "BTC",
-        min_periods: int = 1
-    ):
+        ret_cols: List[str],
+        targets: List[str],
+        windows: List[Tuple[str, int]],
+        include_vol: bool = True
+    ) -> List[str]:
+        """Output feature names in canonical order: per window, vol (all) then corr (targets)."""
+        names: List[str] = []
+        for window_str, _ in windows:
+            if include_vol:
+                names += [f"vol_{c.replace('ret_', '')}_{window_str}" for c in ret_cols]
+            names += [
+                f"corr_{c.replace('ret_', '')}_{self.anchor_symbol}_{window_str}" for c in targets
+            ]
+        return names
+
+    def _transform_moments(
+        self,
+        data: pl.LazyFrame,
+        ret_cols: List[str],
+        anchor_col: str,
+        targets: List[str]
+    ) -> pl.LazyFrame:
         """
-        Args:
-            windows: Time windows (e.g., ["1h", "4h"]). 
-            anchor_symbol: Reference asset for correlation.
-            min_periods: Minimum observations for valid result.
+        Rolling std/corr from precomputed moments:
+        var  = (S_xx - S_x^2 / n) / (n - 1)
+        corr = (S_xa - S_x * S_a / n) / sqrt((S_xx - S_x^2 / n) * (S_aa - S_a^2 / n))
+        Nulls are masked out of every sum (pairwise for corr), like rolling_std/rolling_corr.
         """
-        self.windows = windows or ["1h", "4h", "24h"]
-        self.anchor_symbol = anchor_symbol
-        self.min_periods = min_periods
+        min_n = max(self.min_periods, 2)
 
-    def transform(
-        self, 
-        data: pl.LazyFrame, 
-        **kwargs: Any
-    ) -> 'Result[pl.LazyFrame, str]':
-        try:
-            # 1. Schema Inspection
-            schema_cols = data.collect_schema().names()
-            
-            # 2. Find return columns (ret_*)
-            ret_cols = [c for c in schema_cols if c.startswith("ret_")]
-            if not ret_cols:
-                return Err("Tier 2 Error: No 'ret_*' columns found.")
+        # --- Stage 1: helper columns, computed once for all windows ---
+        helpers: List[pl.Expr] = []
+        for c in ret_cols:
+            x = pl.col(c).cast(pl.Float64)
+            helpers += [
+                x.is_not_null().cast(pl.Float64).alias(f"__n_{c}"),
+                x.fill_null(0.0).alias(f"__x_{c}"),
+                x.pow(2).fill_null(0.0).alias(f"__sq_{c}"),
+            ]
+        for c in targets:
+            pair = pl.col(c).is_not_null() & pl.col(anchor_col).is_not_null()
+            x = pl.when(pair).then(pl.col(c).cast(pl.Float64)).otherwise(0.0)
+            a = pl.when(pair).then(pl.col(anchor_col).cast(pl.Float64)).otherwise(0.0)
+            helpers += [
+                pair.cast(pl.Float64).alias(f"__pn_{c}"),
+                x.alias(f"__px_{c}"),
+                a.alias(f"__pa_{c}"),
+                x.pow(2).alias(f"__pxx_{c}"),
+                a.pow(2).alias(f"__paa_{c}"),
+                (x * a).alias(f"__xy_{c}"),
+            ]
+        helper_names = [e.meta.output_name() for e in helpers]
 
-            # 3. Check Anchor
-            anchor_col = f"ret_{self.anchor_symbol}"
-            has_anchor = anchor_col in ret_cols
-            
-            if not has_anchor:
-                logger.warning(f"Anchor '{self.anchor_symbol}' missing. Skipping correlation.")
+        # --- Stage 2: per-window features from rolling sums only ---
+        features: List[pl.Expr] = []
+        for window_str, n_rows in self._window_rows:
 
-            # 4. Build Expressions
-            expressions = []
-            
-            for window_str in self.windows:
-                # Convert "1h" -> 60, "1d" -> 1440
-                n_rows = self._parse_window_to_rows(window_str)
-                
-                # A. ROLLING VOLATILITY
-                for ret_col in ret_cols:
-                    asset_name = ret_col.replace("ret_", "")
-                    feat_name = f"vol_{asset_name}_{window_str}"
-                    
-                    # Row-based rolling std (Ultra Stable API)
-                    vol_expr = (
-                        pl.col(ret_col)
-                        .rolling_std(window_size=n_rows, min_periods=self.min_periods)
-                        .fill_nan(0.0)
-                        .fill_null(0.0)
-                        .alias(feat_name)
-                    )
-                    expressions.append(vol_expr)
-                
-                # B. ROLLING CORRELATION
-                if has_anchor:
-                    for ret_col in ret_cols:
-                        if ret_col == anchor_col: continue 
-                        
-                        asset_name = ret_col.replace("ret_", "")
-                        feat_name = f"corr_{asset_name}_{self.anchor_symbol}_{window_str}"
-                        
-                        # Row-based rolling corr (Top-level function for max stability)
-                        corr_expr = (
-                            pl.rolling_corr(
-                                pl.col(ret_col),
-                                pl.col(anchor_col),
-                                window_size=n_rows,
-                                min_periods=self.min_periods
-                            )
-                            .fill_nan(0.0)
-                            .fill_null(0.0)
-                            .alias(feat_name)
-                        )
-                        expressions.append(corr_expr)
+            def rsum(name: str) -> pl.Expr:
+                return pl.col(name).rolling_sum(window_size=n_rows, min_periods=1)
 
-            # 5. Execute
-            return Ok(data.with_columns(expressions))
+            for c in ret_cols:
+                n, sx = rsum(f"__n_{c}"), rsum(f"__x_{c}")
+                var = ((rsum(f"__sq_{c}") - sx.pow(2) / n) / (n - 1)).clip(lower_bound=0.0)
+                features.append(
+                    pl.when(n >= min_n).then(var.sqrt()).otherwise(0.0)
+                    .alias(f"vol_{c.replace('ret_', '')}_{window_str}")
+                )
+            for c in targets:
+                n, sx, sa = rsum(f"__pn_{c}"), rsum(f"__px_{c}"), rsum(f"__pa_{c}")
+                cov = rsum(f"__xy_{c}") - sx * sa / n
+                var_x = rsum(f"__pxx_{c}") - sx.pow(2) / n
+                var_a = rsum(f"__paa_{c}") - sa.pow(2) / n
+                corr = (cov / (var_x * var_a).sqrt()).clip(-1.0, 1.0)
+                features.append(
+                    pl.when((n >= min_n) & (var_x > 0.0) & (var_a > 0.0))
+                    .then(corr).otherwise(0.0)
+                    .fill_nan(0.0)
+                    .alias(f"corr_{c.replace('ret_', '')}_{self.anchor_symbol}_{window_str}")
+                )
 
-        except Exception as e:
-            logger.error(f"Microstructure Calculation Failed: {e}", exc_info=True)
-            return Err(f"Tier 2 Error: {str(e)}")
+        return data.with_columns(helpers).with_columns(features).drop(helper_names)
 
-    def _parse_window_to_rows(self, window_str: str) -> int:
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _parse_window_to_rows(window_str: str) -> int:
         """Dirty but effective: parses Polars duration to row count (1m base)."""
         try:
             val = int(''.join(filter(str.isdigit, window_str)))
@@ -295,6 +442,12 @@ class MicrostructureTransformer:
 
 # ====================== FACTORY ======================
 def create_microstructure_transformer(windows=None, anchor_symbol="BTC", **kwargs):
-    return MicrostructureTransformer(windows=windows, anchor_symbol=anchor_symbol)
+    return MicrostructureTransformer(
+        windows=windows,
+        anchor_symbol=anchor_symbol,
+        use_numba=kwargs.get("use_numba", False),
+        use_moments=kwargs.get("use_moments", False),
+        numba_corr_min_rows=kwargs.get("numba_corr_min_rows")
+    )
 
 __all__ = ["MicrostructureTransformer", "create_microstructure_transformer"]
@@ -1,11 +1,16 @@
 """
 STATIONARITY ENGINE (TIER 3)
 Focus: Statistical Arbitrage Metrics (Rolling Beta, Spread, Z-Score).
+Location: research/processing/features/stat_arb.py
 Architecture: Tiered Chaining (Beta -> Spread -> Z-Score)
+Compatibility: Polars 1.x (Integer-based stability)
 """
+import functools
 import logging
+import re
+from dataclasses import dataclass
 import polars as pl
-from typing import List, Any
+from typing import Dict, List, Any, Tuple, Union
 
 # Type-safe imports
 from typing import TYPE_CHECKING
@@ -16,6 +21,147 @@ from ...shared import Ok, Err
 
 logger = logging.getLogger("StatArbTransformer")
 
+# Row multipliers on a 1m base grid
+_WINDOW_UNIT_ROWS = {
+    "": 1, "m": 1, "min": 1,
+    "h": 60, "hr": 60,
+    "d": 1440, "day": 1440,
+    "w": 10080, "week": 10080,
+}
+_WINDOW_PATTERN = re.compile(r"(\d+)\s*([a-z]*)")
+
+@functools.lru_cache(maxsize=64)
+def _parse_window_to_rows(window_str: str) -> int:
+    """Convert duration strings ("60m", "24h", "1w") to row counts (1m base)."""
+    match = _WINDOW_PATTERN.fullmatch(window_str.strip().lower())
+    if match is None:
+        return 60 # Default to 1 hour
+    val, unit = int(match.group(1)), match.group(2)
+    return val * _WINDOW_UNIT_ROWS.get(unit, 1)
+
+@dataclass(frozen=True, slots=True)
+class _AssetCols:
+    """Column names for one target asset, derived once per transform call."""
+    log: str
+    asset: str
+    beta: str
+    spread: str
+    zscore: str
+
+# Optional JIT backend (numba tidak wajib; fallback ke transform_collect)
+try:
+    import numpy as np
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+if _HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _stat_arb_kernel(anchor, targets, beta_w, z_w, min_periods, betas, spreads, zscores):
+        """
+        Rolling beta / spread / z-score for every column of targets (N, A) against
+        anchor (N,). NaN = missing (pairwise for Cov).
+        Spread is NaN where its inputs are missing; beta and z-score are 0.0-filled.
+
+        Welford, NOT sum(x^2)/n - mean^2: on 1w windows (10080 rows) of log prices
+        the naive identity cancels catastrophically and can go negative, which the
+        zero-guard would turn into a spurious beta = 0. Sliding form (fixed window):
+          add x:    n += 1; d = x - mean; mean += d / n; M2 += d * (x - mean)
+          remove x: n -= 1; d = x - mean; mean -= d / n; M2 -= d * (x - mean)
+          Cov:      C += (x - mean_x_old) * (y - mean_y_new)   (sign-mirrored on remove)
+        M2 is clamped at 0 after a removal to absorb residual rounding.
+        """
+        n_rows, n_assets = targets.shape
+
+        # Var(anchor) once, shared by every asset
+        var_a = np.empty(n_rows)
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        for i in range(n_rows):
+            u = anchor[i]
+            if not np.isnan(u):
+                n += 1
+                d = u - mean
+                mean += d / n
+                m2 += d * (u - mean)
+            if i >= beta_w:
+                ou = anchor[i - beta_w]
+                if not np.isnan(ou):
+                    n -= 1
+                    if n == 0:
+                        mean = 0.0
+                        m2 = 0.0
+                    else:
+                        d = ou - mean
+                        mean -= d / n
+                        m2 = max(m2 - d * (ou - mean), 0.0)
+            var_a[i] = m2 / (n - 1) if (n >= min_periods and n >= 2) else np.nan
+
+        for k in prange(n_assets):
+            # Stage A: pairwise Cov(target, anchor) -> beta -> spread
+            n = 0
+            mx = 0.0
+            ma = 0.0
+            sxa = 0.0
+            for i in range(n_rows):
+                v = targets[i, k]
+                u = anchor[i]
+                if not (np.isnan(v) or np.isnan(u)):
+                    n += 1
+                    dx = v - mx
+                    mx += dx / n
+                    ma += (u - ma) / n
+                    sxa += dx * (u - ma)
+                if i >= beta_w:
+                    ov = targets[i - beta_w, k]
+                    ou = anchor[i - beta_w]
+                    if not (np.isnan(ov) or np.isnan(ou)):
+                        n -= 1
+                        if n == 0:
+                            mx = ma = sxa = 0.0
+                        else:
+                            dx = ov - mx
+                            mx -= dx / n
+                            ma -= (ou - ma) / n
+                            sxa -= dx * (ou - ma)
+
+                va = var_a[i]
+                beta = 0.0
+                if n >= min_periods and n >= 2 and not np.isnan(va) and va >= 1e-9:
+                    beta = (sxa / (n - 1)) / va
+                betas[i, k] = beta
+                spreads[i, k] = v - beta * u
+
+            # Stage B: rolling mean/std of the spread -> z-score
+            n = 0
+            mean = 0.0
+            m2 = 0.0
+            for i in range(n_rows):
+                s = spreads[i, k]
+                if not np.isnan(s):
+                    n += 1
+                    d = s - mean
+                    mean += d / n
+                    m2 += d * (s - mean)
+                if i >= z_w:
+                    os_ = spreads[i - z_w, k]
+                    if not np.isnan(os_):
+                        n -= 1
+                        if n == 0:
+                            mean = 0.0
+                            m2 = 0.0
+                        else:
+                            d = os_ - mean
+                            mean -= d / n
+                            m2 = max(m2 - d * (os_ - mean), 0.0)
+                z = 0.0
+                if not np.isnan(s) and n >= min_periods and n >= 2:
+                    std = np.sqrt(m2 / (n - 1)) if m2 > 0.0 else 0.0
+                    z = (s - mean) / max(std, 1e-12)
+                zscores[i, k] = z
+
 class StatArbTransformer:
     """
     Tier 3 Transformer: Statistical Arbitrage Engine.
@@ -25,57 +171,85 @@ class StatArbTransformer:
     2. Spread (Residual): Target - (Beta * Anchor)
     3. Z-Score (Signal): Normalized Spread deviation.
     
-    Compliance:
-    - Polars 1.x Stable.
-    - Integer-based rolling (KOTOR strategy).
-    - Pure Lazy execution (No .collect()).
+    Production Features:
+    - Pure Lazy execution (No .collect() inside).
+    - Numerical Guardrails against zero variance noise.
+    - Two stages: rolling beta materialized once; spread inlined into z-score.
+    - `transform_collect`: eager path, one plan per target via pl.collect_all.
+    - Optional Float32 beta stage (`use_float32=True`): rolling Cov/Var read half
+      the bytes, at the cost of ~1e-5 absolute error on beta (and z-score noise on
+      near-flat spreads). Beta is cast back to Float64 before spread/z-score so the
+      registry's precision contract still holds; input log columns are untouched.
+    - `transform_eager_numba`: in-memory JIT path (one parallel pass per asset),
+      requires numba; otherwise falls back to `transform_collect`.
     """
 
+    # Pipeline hint: reads only upstream columns, appends new ones, keeps rows
+    independent = True
+
     def __init__(
         self,
         beta_window: str = "1w",
         zscore_window: str = "24h",
         anchor_symbol: str = "BTC",
-        min_periods: int = 2
+        min_periods: int = 2,
+        use_float32: bool = False
     ):
-        self.beta_window = self._parse_to_rows(beta_window)
-        self.zscore_window = self._parse_to_rows(zscore_window)
+        self.beta_window = _parse_window_to_rows(beta_window)
+        self.zscore_window = _parse_window_to_rows(zscore_window)
         self.anchor_symbol = anchor_symbol
         self.min_periods = min_periods
 
+        # Resolved (anchor_col, specs) per schema layout
+        self._spec_cache: Dict[Tuple[str, ...], Tuple[str, List[_AssetCols]]] = {}
+
+        # Degenerate windows (< 2 rows or < min_periods) can never yield a valid
+        # variance: beta / z-score are constant 0.0, so skip the rolling kernels
+        min_rows = max(2, min_periods)
+        self._beta_degenerate = self.beta_window < min_rows
+        self._zscore_degenerate = self.zscore_window < min_rows
+        if self._beta_degenerate or self._zscore_degenerate:
+            logger.warning(
+                f"Degenerate StatArb window (beta={self.beta_window}, z={self.zscore_window} rows, "
+                f"min_periods={min_periods}). Affected features are constant 0.0."
+            )
+        # Compute dtype for the beta kernels (output is always Float64)
+        self.use_float32 = use_float32
+        self._compute_dtype = pl.Float32 if use_float32 else pl.Float64
+
+    @property
+    def config_hash(self) -> int:
+        """Hash of the constructor params (pipeline result-cache key)."""
+        return hash((
+            type(self).__name__, self.beta_window, self.zscore_window, self.anchor_symbol,
+            self.min_periods, self.use_float32,
+        ))
+
     def transform(
         self, 
         data: pl.LazyFrame, 
         **kwargs: Any
     ) -> 'Result[pl.LazyFrame, str]':
+        """
+        Execute StatArb transformations with chained dependencies.
+        Optional kwarg `schema_cache`: column names of `data`, reused across calls
+        on same-shaped frames to skip re-resolving the lazy plan's schema.
+        """
         try:
-            # 1. Schema Inspection
-            schema_cols = data.collect_schema().names()
-            
-            # 2. Prerequisites Check (Log Prices from Tier 1)
-            log_cols = [c for c in schema_cols if c.startswith("log_")]
-            anchor_col = f"log_{self.anchor_symbol}"
-            
-            if anchor_col not in log_cols:
-                return Err(f"Tier 3 Error: Anchor '{anchor_col}' not found. Run Tier 1 first.")
-            
-            if len(log_cols) < 2:
-                return Err("Tier 3 Error: Need at least one pair for arbitrage.")
+            schema_cols = kwargs.get("schema_cache") or data.collect_schema().names()
+            resolved = self._resolve_columns(schema_cols)
+            if resolved.is_err():
+                return resolved
+            anchor_col, specs = resolved.unwrap()
 
-            logger.info(f"Computing StatArb Features against {self.anchor_symbol}")
+            logger.info("Computing StatArb Features against anchor: %s", self.anchor_symbol)
 
-            # 3. Execution via Chaining (Beta -> Spread -> Z-Score)
-            # Stage A: Calculate Beta
-            beta_exprs = self._build_beta_expressions(log_cols, anchor_col)
-            lf_with_beta = data.with_columns(beta_exprs)
-            
-            # Stage B: Calculate Spread (Depends on Beta)
-            spread_exprs = self._build_spread_expressions(log_cols, anchor_col)
-            lf_with_spread = lf_with_beta.with_columns(spread_exprs)
-            
-            # Stage C: Calculate Z-Score (Depends on Spread)
-            zscore_exprs = self._build_zscore_expressions(log_cols)
-            final_lf = lf_with_spread.with_columns(zscore_exprs)
+            # Staged execution (Var(anchor) -> Beta -> Spread & Z-Score)
+            anchor_var_col = f"__var_{anchor_col}"
+            final_lf = self._build_feature_plan(
+                data.with_columns(self._anchor_var_expression(anchor_col, anchor_var_col)),
+                specs, anchor_col, anchor_var_col
+            ).drop(anchor_var_col)
 
             return Ok(final_lf)
 
@@ -83,165 +257,227 @@ class StatArbTransformer:
             logger.error(f"StatArb Calculation Failed: {e}", exc_info=True)
             return Err(f"Tier 3 Error: {str(e)}")
 
-    def _build_beta_expressions(self, log_cols: List[str], anchor_col: str) -> List[pl.Expr]:
-        exprs = []
-        for col in log_cols:
-            if col == anchor_col: continue
-            
-            asset_name = col.replace("log_", "")
-            beta_name = f"beta_{asset_name}_{self.anchor_symbol}"
-            
-            # Beta = Cov(X,Y) / Var(X)
-            # Use max_horizontal to prevent division by zero
-            cov = pl.rolling_cov(pl.col(col), pl.col(anchor_col), 
-                                 window_size=self.beta_window, min_periods=self.min_periods)
-            var = pl.col(anchor_col).rolling_var(window_size=self.beta_window, 
-                                                 min_periods=self.min_periods)
-            
-            exprs.append(
-                (cov / pl.max_horizontal(var, pl.lit(1e-12)))
-                .fill_nan(0.0).fill_null(0.0).alias(beta_name)
-            )
-        return exprs
+    def preview_schema(self, schema: Dict[str, Any]) -> 'Result[Dict[str, Any], str]':
+        """Output schema of transform() for an input {column: dtype} (features are Float64)."""
+        resolved = self._resolve_columns(list(schema))
+        if resolved.is_err():
+            return resolved
+        _, specs = resolved.unwrap()
 
-    def _build_spread_expressions(self, log_cols: List[str], anchor_col: str) -> List[pl.Expr]:
-        exprs = []
-        for col in log_cols:
-            if col == anchor_col: continue
-            
-            asset_name = col.replace("log_", "")
-            beta_name = f"beta_{asset_name}_{self.anchor_symbol}"
-            spread_name = f"spread_{asset_name}"
-            
-            # Spread = log_y - (beta * log_x)
-            exprs.append(
-                (pl.col(col) - (pl.col(beta_name) * pl.col(anchor_col))).alias(spread_name)
-            )
-        return exprs
+        out = dict(schema)
+        for name in self._feature_names(specs):
+            out[name] = pl.Float64
+        return Ok(out)
 
-    def _build_zscore_expressions(self, log_cols: List[str]) -> List[pl.Expr]:
-        exprs = []
-        for col in log_cols:
-            if col == self.anchor_symbol.lower(): continue # Handle specific naming if needed
-            
-            asset_name = col.replace("log_", "")
-            if asset_name == self.anchor_symbol: continue
-            
-            spread_name = f"spread_{asset_name}"
-            z_name = f"z_score_{asset_name}"
-            
-            # Z = (Spread - Mean) / Std
-            mean = pl.col(spread_name).rolling_mean(window_size=self.zscore_window, 
-                                                   min_periods=self.min_periods)
-            std = pl.col(spread_name).rolling_std(window_size=self.zscore_window, 
-                                                 min_periods=self.min_periods)
-"""
-STATIONARITY ENGINE (TIER 3)
-Focus: Statistical Arbitrage Metrics (Rolling Beta, Spread, Z-Score).
-Location: research/processing/features/stat_arb.py
-Architecture: Tiered Chaining (Beta -> Spread -> Z-Score)
-Compatibility: Polars 1.x (Integer-based stability)
-"""
-import logging
-import polars as pl
-from typing import List, Any
+    def transform_collect(
+        self,
+        data: pl.LazyFrame,
+        **kwargs: Any
+    ) -> 'Result[pl.DataFrame, str]':
+        """
+        Eager variant of `transform` for large asset universes.
+        Every target only depends on itself + the anchor, so each one gets its own
+        small plan and all plans are collected together with `pl.collect_all`.
+        Output (columns and values) matches `transform(data).collect()`.
+        """
+        try:
+            schema_cols = kwargs.get("schema_cache") or data.collect_schema().names()
+            resolved = self._resolve_columns(schema_cols)
+            if resolved.is_err():
+                return resolved
+            anchor_col, specs = resolved.unwrap()
 
-# Type-safe imports
-from typing import TYPE_CHECKING
-if TYPE_CHECKING:
-    from ...shared import Result
+            logger.info("Computing StatArb Features against anchor: %s (%d plans)", self.anchor_symbol, len(specs))
 
+            # Var(anchor) sekali saja, lalu dibagi ke semua plan per-asset
+            anchor_var_col = f"__var_{anchor_col}"
+            base = data.with_columns(self._anchor_var_expression(anchor_col, anchor_var_col)).collect()
 
-logger = logging.getLogger("StatArbTransformer")
+            plans = [
+                self._build_feature_plan(
+                    base.lazy().select(anchor_col, anchor_var_col, spec.log),
+                    [spec], anchor_col, anchor_var_col
+                ).select(self._feature_names([spec]))
+                for spec in specs
+            ]
+            frames = pl.collect_all(plans)
 
-class StatArbTransformer:
-    """
-    Tier 3 Transformer: Statistical Arbitrage Engine.
-    
-    Mathematical Sequence:
-    1. Beta (Hedge Ratio): Cov(Target, Anchor) / Var(Anchor)
-    2. Spread (Residual): Target - (Beta * Anchor)
-    3. Z-Score (Signal): Normalized Spread deviation.
-    
-    Production Features:
-    - Pure Lazy execution (No .collect() inside).
-    - Numerical Guardrails against zero variance noise.
-    - Explicit chaining to handle column dependencies.
-    """
+            df_out = pl.concat([base.drop(anchor_var_col), *frames], how="horizontal")
+            base_cols = [c for c in base.columns if c != anchor_var_col]
+            return Ok(df_out.select(base_cols + self._feature_names(specs)))
 
-    def __init__(
-        self,
-        beta_window: str = "1w",
-        zscore_window: str = "24h",
-        anchor_symbol: str = "BTC",
-        min_periods: int = 2
-    ):
-        self.beta_window = self._parse_to_rows(beta_window)
-        self.zscore_window = self._parse_to_rows(zscore_window)
-        self.anchor_symbol = anchor_symbol
-        self.min_periods = min_periods
+        except Exception as e:
+            logger.error(f"StatArb Calculation Failed: {e}", exc_info=True)
+            return Err(f"Tier 3 Error: {str(e)}")
 
-    def transform(
-        self, 
-        data: pl.LazyFrame, 
+    def transform_eager_numba(
+        self,
+        data: Union[pl.DataFrame, pl.LazyFrame],
         **kwargs: Any
-    ) -> 'Result[pl.LazyFrame, str]':
+    ) -> 'Result[pl.DataFrame, str]':
         """
-        Execute StatArb transformations with chained dependencies.
+        Eager JIT variant for frames that fit in memory (always Float64).
+        Log columns are read into an (N, A) matrix and beta/spread/z-score are
+        produced by `_stat_arb_kernel` in one pass per asset (prange over assets).
+        Same columns and order as `transform(data).collect()`.
         """
+        if not _HAS_NUMBA:
+            logger.warning("numba not installed. Falling back to transform_collect.")
+            return self.transform_collect(data.lazy(), **kwargs)
+
         try:
-            # 1. Schema Inspection
-            schema_cols = data.collect_schema().names()
-            
-            # 2. Prerequisites Check (Log Prices from Tier 1)
-            log_cols = [c for c in schema_cols if c.startswith("log_")]
-            anchor_col = f"log_{self.anchor_symbol}"
-            
-            if anchor_col not in log_cols:
-                return Err(f"Tier 3 Error: Anchor '{anchor_col}' not found. Run Tier 1 first.")
-            
-            if len(log_cols) < 2:
-                return Err("Tier 3 Error: Need at least one target asset for arbitrage.")
+            df = data.collect() if isinstance(data, pl.LazyFrame) else data
 
-            logger.info(f"Computing StatArb Features against anchor: {self.anchor_symbol}")
+            resolved = self._resolve_columns(kwargs.get("schema_cache") or df.columns)
+            if resolved.is_err():
+                return resolved
+            anchor_col, specs = resolved.unwrap()
+            targets = [spec.log for spec in specs]
 
-            # 3. Execution via Chaining (Ensures Beta exists before Spread, etc.)
-            
-            # STAGE A: Calculate Rolling Beta
-            beta_exprs = self._build_beta_expressions(log_cols, anchor_col)
-            lf_stage_a = data.with_columns(beta_exprs)
-            
-            # STAGE B: Calculate Spread (Depends on Beta)
-            spread_exprs = self._build_spread_expressions(log_cols, anchor_col)
-            lf_stage_b = lf_stage_a.with_columns(spread_exprs)
-            
-            # STAGE C: Calculate Z-Score (Depends on Spread)
-            zscore_exprs = self._build_zscore_expressions(log_cols)
-            final_lf = lf_stage_b.with_columns(zscore_exprs)
+            logger.info("Computing StatArb Features against anchor: %s (numba)", self.anchor_symbol)
 
-            return Ok(final_lf)
+            # Null -> NaN so the kernel can skip missing rows
+            logs = df.select(pl.col([anchor_col] + targets).cast(pl.Float64).fill_null(float("nan")))
+            anchor = np.ascontiguousarray(logs[anchor_col].to_numpy())
+            x = np.asfortranarray(logs.select(targets).to_numpy())
+
+            betas = np.empty_like(x)
+            spreads = np.empty_like(x)
+            zscores = np.empty_like(x)
+            _stat_arb_kernel(
+                anchor, x, self.beta_window, self.zscore_window, self.min_periods,
+                betas, spreads, zscores
+            )
+
+            feats = pl.DataFrame(
+                np.hstack([betas, spreads, zscores]),
+                schema=self._feature_names(specs),
+                orient="row"
+            )
+            # Spread is null where its inputs are null (same as the Polars path)
+            feats = feats.with_columns(pl.col([spec.spread for spec in specs]).fill_nan(None))
+            return Ok(df.hstack(feats))
 
         except Exception as e:
             logger.error(f"StatArb Calculation Failed: {e}", exc_info=True)
             return Err(f"Tier 3 Error: {str(e)}")
 
-    def _build_beta_expressions(self, log_cols: List[str], anchor_col: str) -> List[pl.Expr]:
-        """Build expressions for rolling OLS beta with numerical noise protection."""
+    def collect_streaming(self, lf: pl.LazyFrame) -> pl.DataFrame:
+        """
+        Materialize a transform() result with the streaming engine (lower peak RSS).
+        For multi-year minute bars; the plan has no max_horizontal, so nothing in
+        it forces a fallback to the in-memory engine.
+        """
+        return lf.collect(engine="streaming")
+
+    def _resolve_columns(self, schema_cols: List[str]) -> 'Result[Tuple[str, List[_AssetCols]], str]':
+        """
+        Schema inspection: return (anchor_col, one _AssetCols spec per target).
+        `schema_cols` comes from collect_schema() or the caller's `schema_cache`.
+        Resolved layouts are memoized per column tuple (same shape -> no rescan).
+        """
+        key = tuple(schema_cols)
+        cached = self._spec_cache.get(key)
+        if cached is not None:
+            return Ok(cached)
+
+        # Prerequisites Check (Log Prices from Tier 1)
+        anchor_col = f"log_{self.anchor_symbol}"
+        log_cols = [c for c in schema_cols if c.startswith("log_")]
+
+        if anchor_col not in log_cols:
+            return Err(f"Tier 3 Error: Anchor '{anchor_col}' not found. Run Tier 1 first.")
+
+        if len(log_cols) < 2:
+            return Err("Tier 3 Error: Need at least one target asset for arbitrage.")
+
+        specs = [
+            _AssetCols(
+                log=c,
+                asset=c[4:],
+                beta=f"beta_{c[4:]}_{self.anchor_symbol}",
+                spread=f"spread_{c[4:]}",
+                zscore=f"z_score_{c[4:]}"
+            )
+            for c in log_cols if c != anchor_col
+        ]
+        self._spec_cache[key] = (anchor_col, specs)
+        return Ok((anchor_col, specs))
+
+    def _anchor_var_expression(self, anchor_col: str, anchor_var_col: str) -> pl.Expr:
+        """Var(anchor) is shared by every beta: computed once as a helper column."""
+        if self._beta_degenerate:
+            return pl.lit(None, dtype=pl.Float64).alias(anchor_var_col)
+        return self._src(anchor_col).rolling_var(
+            window_size=self.beta_window,
+            min_periods=self.min_periods
+        ).alias(anchor_var_col)
+
+    def _build_feature_plan(
+        self,
+        lf: pl.LazyFrame,
+        specs: List[_AssetCols],
+        anchor_col: str,
+        anchor_var_col: str
+    ) -> pl.LazyFrame:
+        """
+        Beta is rolling-heavy, so it is materialized once as a column.
+        Spread is elementwise, so it is inlined into the z-score expressions
+        and both land in ONE with_columns (no intermediate spread stage).
+        """
+        lf_beta = lf.with_columns(self._build_beta_expressions(specs, anchor_col, anchor_var_col))
+
+        spreads = {
+            spec: pl.col(spec.log) - (pl.col(spec.beta) * pl.col(anchor_col))
+            for spec in specs
+        }
+        return lf_beta.with_columns(
+            self._build_spread_expressions(spreads)
+            + self._build_zscore_expressions(spreads)
+        )
+
+    def _src(self, col: str) -> pl.Expr:
+        """
+        Beta-stage input in the compute dtype. Float32 inputs are first shifted by
+        their first valid value (Cov/Var are shift-invariant) so the cast keeps
+        the small log-price increments instead of the large price level.
+        """
+        if self.use_float32:
+            return (pl.col(col) - pl.col(col).drop_nulls().first()).cast(pl.Float32)
+        return pl.col(col)
+
+    def _feature_names(self, specs: List[_AssetCols]) -> List[str]:
+        """Canonical output order: all betas, then spreads, then z-scores."""
+        return (
+            [spec.beta for spec in specs]
+            + [spec.spread for spec in specs]
+            + [spec.zscore for spec in specs]
+        )
+
+    def _build_beta_expressions(
+        self,
+        specs: List[_AssetCols],
+        anchor_col: str,
+        anchor_var_col: str
+    ) -> List[pl.Expr]:
+        """
+        Build expressions for rolling OLS beta with numerical noise protection.
+        Var(anchor) is read from the precomputed `anchor_var_col`; only the pairwise
+        Cov(target, anchor) is computed per target (it masks nulls per pair, so the
+        anchor's rolling mean cannot be shared across targets).
+        Note: corr * std(target) / std(anchor) is the same beta but costs a rolling
+        corr (cov + two vars) plus a target std per asset (~2.6x slower measured).
+        """
+        if self._beta_degenerate:
+            return [pl.lit(0.0, dtype=pl.Float64).alias(spec.beta) for spec in specs]
+
+        var = pl.col(anchor_var_col)
         exprs = []
-        for col in log_cols:
-            if col == anchor_col: continue
-            
-            asset_name = col.replace("log_", "")
-            beta_name = f"beta_{asset_name}_{self.anchor_symbol}"
-            
+        for spec in specs:
             # Beta = Cov(X,Y) / Var(X)
             cov = pl.rolling_cov(
-                pl.col(col), 
-                pl.col(anchor_col), 
-                window_size=self.beta_window, 
-                min_periods=self.min_periods
-            )
-            var = pl.col(anchor_col).rolling_var(
+                self._src(spec.log), 
+                self._src(anchor_col), 
                 window_size=self.beta_window, 
                 min_periods=self.min_periods
             )
@@ -250,72 +486,52 @@ class StatArbTransformer:
             # Jika varians di bawah 1e-9, paksa beta ke 0.0
             beta_expr = (
                 pl.when(var < 1e-9)
-                .then(pl.lit(0.0))
+                .then(pl.lit(0.0, dtype=self._compute_dtype))
                 .otherwise(cov / var)
                 .fill_nan(0.0)
                 .fill_null(0.0)
-                .alias(beta_name)
+                .cast(pl.Float64)
+                .alias(spec.beta)
             )
             exprs.append(beta_expr)
         return exprs
 
-    def _build_spread_expressions(self, log_cols: List[str], anchor_col: str) -> List[pl.Expr]:
-        """Build expressions for spread (Residual)."""
-        exprs = []
-        for col in log_cols:
-            if col == anchor_col: continue
-            
-            asset_name = col.replace("log_", "")
-            beta_name = f"beta_{asset_name}_{self.anchor_symbol}"
-            spread_name = f"spread_{asset_name}"
-            
-            # Spread = log_target - (beta * log_anchor)
-            exprs.append(
-                (pl.col(col) - (pl.col(beta_name) * pl.col(anchor_col))).alias(spread_name)
-            )
-        return exprs
+    def _build_spread_expressions(self, spreads: Dict[_AssetCols, pl.Expr]) -> List[pl.Expr]:
+        """Name the spread expressions (Residual: log_target - beta * log_anchor)."""
+        return [expr.alias(spec.spread) for spec, expr in spreads.items()]
+
+    def _build_zscore_expressions(self, spreads: Dict[_AssetCols, pl.Expr]) -> List[pl.Expr]:
+        """
+        Build z-score expressions directly on top of the spread expressions.
+        Mean and std stay two rolling calls: wrapping them in a per-asset pl.struct
+        does not make Polars fuse the traversal (measured: no change). The fused
+        single pass lives in the numba kernel (`transform_eager_numba`).
+        """
+        if self._zscore_degenerate:
+            return [pl.lit(0.0, dtype=pl.Float64).alias(spec.zscore) for spec in spreads]
 
-    def _build_zscore_expressions(self, log_cols: List[str]) -> List[pl.Expr]:
-        """Build expressions for z-score normalization."""
         exprs = []
-        for col in log_cols:
-            asset_name = col.replace("log_", "")
-            if asset_name == self.anchor_symbol: continue
-            
-            spread_name = f"spread_{asset_name}"
-            z_name = f"z_score_{asset_name}"
+        for spec, spread in spreads.items():
             
             # Z = (Spread - RollingMean) / RollingStd
-            mean = pl.col(spread_name).rolling_mean(
+            mean = spread.rolling_mean(
                 window_size=self.zscore_window, 
                 min_periods=self.min_periods
             )
-            std = pl.col(spread_name).rolling_std(
+            std = spread.rolling_std(
                 window_size=self.zscore_window, 
                 min_periods=self.min_periods
             )
             
-            # Guard against division by zero in Z-score calculation
+            # Guard against division by zero in Z-score calculation (single-pass clip)
             exprs.append(
-                ((pl.col(spread_name) - mean) / pl.max_horizontal(std, pl.lit(1e-12)))
+                ((spread - mean) / std.clip(lower_bound=1e-12))
                 .fill_nan(0.0)
                 .fill_null(0.0)
-                .alias(z_name)
+                .alias(spec.zscore)
             )
         return exprs
 
-    def _parse_to_rows(self, window_str: str) -> int:
-        """Helper to convert duration strings to row counts (1m base)."""
-        try:
-            val = int(''.join(filter(str.isdigit, window_str)))
-            unit = ''.join(filter(str.isalpha, window_str)).lower()
-            if unit in ('h', 'hr'): return val * 60
-            if unit in ('d', 'day'): return val * 1440
-            if unit in ('w', 'week'): return val * 10080
-            return val
-        except:
-            return 60 # Default to 1 hour
-
     def get_available_features(self) -> List[str]:
         return ["beta_*", "spread_*", "z_score_*"]
 
@@ -336,3 +552,7 @@ def create_stat_arb_transformer(
     )
 
 __all__ = ["StatArbTransformer", "create_stat_arb_transformer"]
+
+if __debug__:
+    # Export sanity: __all__ must list names (strings) bound in this module
+    assert all(isinstance(name, str) and name in globals() for name in __all__), __all__
@@ -2,28 +2,138 @@
 PIPELINE ORCHESTRATOR - The Boss of Node B
 Implements ProcessingPipeline protocol with fail-fast execution.
 """
+import asyncio
+import contextlib
+import functools
 import logging
+import os
 import polars as pl
-import time
-from typing import Dict, Any, List, Optional, TYPE_CHECKING
-
-# Type-safe imports for Protocol Checks
-if TYPE_CHECKING:
-    from .protocols import (
-        TimeSeriesAligner, 
-        DataValidator, 
-        FeatureTransformer,
-        RefineryStorage
-    )
-    from ..shared import Result
+import sys
+from time import perf_counter_ns
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from types import MappingProxyType
+from typing import Callable, Deque, Dict, Any, List, NamedTuple, Optional, Tuple, Union
+
+# Runtime imports bound once (neither module imports the pipeline back)
+from ..shared import Ok, Err, Result
+from .protocols import (
+    TimeSeriesAligner, 
+    DataValidator, 
+    FeatureTransformer,
+    RefineryStorage
+)
 
 logger = logging.getLogger("ProcessingPipeline")
 
+# End-of-stream marker for the async stage queues
+_SENTINEL = object()
+
+# Post-alignment step signature: (LazyFrame, kwargs) -> Result[LazyFrame, str]
+_StageFn = Callable[[pl.LazyFrame, Dict[str, Any]], 'Result[pl.LazyFrame, str]']
+
+# Orchestration-only kwargs: stripped ONCE per run, never re-packed into every tf.transform
+_PIPELINE_KWARGS = frozenset({
+    "skip_alignment", "skip_validation", "validation_rules",
+    "storage_destination", "sync_storage", "stack_assets",
+    "prefetch_assets", "prefetch_width", "streaming_chunk_size", "skip_storage",
+    "use_result_cache", "lazy_validation",
+})
+
+# Rules override used once the factory verified a fixed input schema
+_SCHEMA_VERIFIED_RULES = {"validate_schema": False}
+
+# Transformer run kinds (see StandardPipeline._group_transformers)
+_RUN_SERIAL = "serial"
+_RUN_BRANCH = "branch"
+_RUN_EXPRS = "exprs"
+
+# LRU bound for the opt-in result cache (use_result_cache=True)
+_RESULT_CACHE_SIZE = 64
+
+# collect_all fan-in cap: very wide collect_all calls over-allocate
+_MAX_COLLECT_BATCH = 64
+
+# Sink row-group size when the caller gives no streaming_chunk_size
+_DEFAULT_ROW_GROUP = 50_000
+
+# Bound on the audit trail; walk-forward loops reuse one pipeline thousands of times
+_STEP_LOG_MAXLEN = 1024
+
+
+class _TransformFailed(Exception):
+    """Internal short-circuit for the transformer loop; converted to Err at the stage boundary."""
+
+
+class _BoundTransformer(NamedTuple):
+    """Per-transformer lookups resolved once at plan build (unpacked as locals per run)."""
+    tf: Any
+    name: str
+    transform: Callable[..., Any]
+    needs_data: Optional[Callable[[], bool]]
+
+
+class _NumbaColumnTransformer:
+    """
+    Wraps a compiled 1-D kernel (ndarray -> ndarray, same length) as a FeatureTransformer.
+    The kernel runs INSIDE the lazy plan via map_batches on the whole column,
+    so the single-plan contract holds (no collect here).
+    """
+    independent = True
+    __slots__ = ("_kernel", "column", "output")
+
+    def __init__(self, kernel: Any, column: str, output: str):
+        self._kernel = kernel
+        self.column = column
+        self.output = output
+
+    @property
+    def available_features(self) -> List[str]:
+        return [self.output]
+
+    def independent_exprs(self, schema_cols: List[str]) -> List[pl.Expr]:
+        kernel = self._kernel
+        output = self.output
+
+        def _run(s: pl.Series) -> pl.Series:
+            return pl.Series(output, kernel(s.to_numpy()), dtype=pl.Float64)
+
+        return [
+            pl.col(self.column).cast(pl.Float64)
+            .map_batches(_run, return_dtype=pl.Float64)
+            .alias(output)
+        ]
+
+    def transform(self, data: pl.LazyFrame, features: Optional[List[str]] = None, **kwargs: Any) -> 'Result[pl.LazyFrame, str]':
+        return Ok(data.with_columns(self.independent_exprs(data.collect_schema().names())))
+
+
 class StandardPipeline:
     """
     Standard implementation of ProcessingPipeline.
     Acts as the Orchestrator that connects all processing stations.
+
+    Single-plan contract: align -> validate -> transforms stay ONE pl.LazyFrame so
+    Polars can push projections/predicates across stage boundaries. Transformers
+    must return a LazyFrame and must not call .collect(). The plan is materialized
+    once: by the caller, by storage.save, or by sink_parquet when the storage
+    advertises `sinkable = True`. The only intermediate collect is the explicit
+    break before a transformer whose `requires_materialization()` returns True.
     """
+
+    # Single shared writer: storage I/O overlaps with the caller's next compute step,
+    # but saves never overlap each other (shared files such as metadata.json)
+    _STORAGE_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline_storage")
+
+    # Per-request pipelines: no per-instance __dict__, slot access on hot attributes
+    __slots__ = (
+        "aligner", "validator", "transformers", "storage",
+        "_validator_summary_fn", "_validator_exprs_fn", "_step_names", "_step_status", "_step_elapsed_ns", "_step_errors", "_step_extra",
+        "_execution_stats", "_last_result",
+        "_storage_future", "_last_storage_result", "_transform_plan", "_transform_plan_len", "_post_stages",
+        "_result_cache", "_schema_verified", "_expected_output_schema",
+        "_transformer_names",
+    )
     
     def __init__(
         self, 
@@ -33,95 +143,164 @@ class StandardPipeline:
         storage: Optional['RefineryStorage'] = None
     ):
         # Validation dilakukan oleh Factory, tapi double check di sini bagus
-        self.aligner = aligner
-        self.validator = validator
-        self.transformers = transformers or []
-        self.storage = storage
+        self.aligner: 'TimeSeriesAligner' = aligner
+        self.validator: Optional['DataValidator'] = validator
+        self.transformers: List['FeatureTransformer'] = transformers or []
+        self.storage: Optional['RefineryStorage'] = storage
+        # Parallel to self.transformers: class names resolved once, not per run
+        self._transformer_names: List[str] = [type(tf).__name__ for tf in self.transformers]
+        # Probe once: optional summary hook on the validator (bound method or None)
+        self._validator_summary_fn: Optional[Callable[[], Dict[str, Any]]] = getattr(validator, "get_validation_summary", None) if validator else None
+        # Optional in-plan hook: as_expressions(schema, rules) -> Result[List[pl.Expr], str]
+        self._validator_exprs_fn: Optional[Callable[..., 'Result[List[pl.Expr], str]']] = getattr(validator, "as_expressions", None) if validator else None
         
-        # State tracking (Audit Trail)
-        self._steps_log: List[Dict[str, Any]] = []
-        self._execution_stats: Dict[str, Any] = {}
+        # State tracking (Audit Trail): one bounded column per field (struct-of-arrays),
+        # so get_steps_frame() hands typed columns to Polars without per-row inference
+        self._step_names: Deque[str] = deque(maxlen=_STEP_LOG_MAXLEN)
+        self._step_status: Deque[str] = deque(maxlen=_STEP_LOG_MAXLEN)
+        self._step_elapsed_ns: Deque[int] = deque(maxlen=_STEP_LOG_MAXLEN)
+        self._step_errors: Deque[Optional[str]] = deque(maxlen=_STEP_LOG_MAXLEN)
+        self._step_extra: Deque[Optional[Dict[str, Any]]] = deque(maxlen=_STEP_LOG_MAXLEN)
+        self._execution_stats: Dict[str, Union[int, float, str]] = {}
         self._last_result: Optional['Result[pl.LazyFrame, str]'] = None
+        self._storage_future: Optional[Future] = None
+        self._last_storage_result: Optional['Result[str, str]'] = None
+        # Transformer run plan, built once per transformer layout (see _transform_groups)
+        # Frozen as a tuple of tuples: fixed post-build, cheapest to iterate
+        self._transform_plan: Optional[Tuple[Tuple[str, Tuple[_BoundTransformer, ...]], ...]] = None
+        self._transform_plan_len: int = -1
+        self._post_stages: Tuple[_StageFn, ...] = self._compose_stages()
+        # (assets fingerprint, transformer signature, kwargs) -> (input frames, LazyFrame), LRU
+        self._result_cache: 'OrderedDict[Any, Tuple[Tuple[pl.LazyFrame, ...], pl.LazyFrame]]' = OrderedDict()
+        # Set by the factory when an expected_schema was pre-verified (see bind_expected_schema)
+        self._schema_verified: bool = False
+        self._expected_output_schema: Optional[Dict[str, Any]] = None
         
-        logger.debug(f"Pipeline initialized. Transformers: {len(self.transformers)}, Storage: {bool(self.storage)}")
+        logger.debug("Pipeline initialized. Transformers: %d, Storage: %s", len(self.transformers), bool(self.storage))
     
     def add_step(self, name: str, processor: Any) -> None:
         """Add processing step dynamically (Protocol requirement)."""
-        # Kita import di dalam method untuk menghindari circular import saat runtime
-        from .protocols import FeatureTransformer
-        
-        if isinstance(processor, FeatureTransformer):
+        if _conforms(processor, FeatureTransformer):
             self.transformers.append(processor)
+            self._transformer_names.append(type(processor).__name__)
+            self._transform_plan = None
+            self._post_stages = self._compose_stages()
             logger.info(f"Added transformer step: {name}")
         else:
             logger.warning(f"Processor {name} is not a FeatureTransformer. Ignored.")
     
+    def bind_expected_schema(self, expected_schema: Dict[str, Any]) -> 'Result[Optional[Dict[str, Any]], str]':
+        """
+        Partial evaluation for a fixed input schema (post-alignment columns -> dtype).
+        Validator schema rules are checked ONCE here, and transformers that expose
+        `preview_schema(schema) -> Result[schema, str]` are chained to precompute the
+        output schema (None once an opaque transformer is reached; a preview Err
+        rejects the schema).
+        Afterwards runs without a validation_rules override skip the per-run
+        collect_schema() in the validator. Caller promises inputs match the schema.
+        """
+        schema = dict(expected_schema)
+        check = getattr(self.validator, "check_schema", None)
+        if check is not None:
+            res = check(schema)
+            if res.is_err():
+                return Err(f"Expected schema rejected by validator: {res.error}")
+
+        for tf in self.transformers:
+            preview = getattr(tf, "preview_schema", None)
+            if preview is None:
+                # Opaque transformer: output schema unknown beyond this point
+                schema = None
+                break
+            preview_res = preview(schema)
+            if preview_res.is_err():
+                return Err(f"Expected schema rejected by {type(tf).__name__}: {preview_res.error}")
+            schema = dict(preview_res.unwrap())
+
+        self._schema_verified = True
+        self._expected_output_schema = schema
+        return Ok(schema)
+
+    def register_numba_transform(
+        self,
+        name: str,
+        fn: Any,
+        column: str,
+        output: Optional[str] = None
+    ) -> 'Result[None, str]':
+        """
+        Append a numeric single-column kernel as a transformer step.
+        `fn` is a plain Python function or an existing @njit dispatcher; it gets a
+        float64 ndarray and must return an array of the same length.
+        numba is imported here only, so pipelines without kernels never pay for it.
+        Pass the same @njit dispatcher to reuse its compilation across pipelines
+        (plain functions are compiled per registration: closures share __code__).
+        """
+        try:
+            from numba import njit
+        except ImportError:
+            return Err("register_numba_transform requires numba")
+
+        try:
+            kernel = fn if hasattr(fn, "py_func") else njit(cache=False)(fn)
+        except Exception as e:
+            return Err(f"Numba Kernel Error: {e}")
+
+        self.add_step(name, _NumbaColumnTransformer(kernel, column, output or f"{column}_{name}"))
+        return Ok(None)
+
     def execute_multi_asset(
         self,
         assets: Dict[str, pl.LazyFrame],
+        *,
+        skip_alignment: bool = False,
         **kwargs: Any
     ) -> 'Result[pl.LazyFrame, str]':
         """
         Execute full pipeline sequence.
+        `skip_alignment=True` passes the first frame straight to validation
+        (explicit parameter: never copied into or looked up in kwargs).
+        `use_result_cache=True`: identical inputs (same LazyFrame objects, same
+        transformer configs via `config_hash`, same kwargs) return the cached plan.
+        Hits still run the storage step, so the destination is written every call.
         """
-        from ..shared import Ok, Err
-        
-        # Reset State
-        self._steps_log = []
-        start_time = time.time()
-        self._execution_stats = {"start_time": start_time}
+        start_ns = self._reset_run_state()
         
         try:
             logger.info("Starting Pipeline Execution...")
+
+            cache_key = self._result_cache_key(assets, skip_alignment, kwargs) if kwargs.get("use_result_cache") else None
+            if cache_key is not None and cache_key in self._result_cache:
+                self._result_cache.move_to_end(cache_key)
+                self._log_step("cache", "hit", perf_counter_ns() - start_ns)
+                cached = self._result_cache[cache_key][1]
+                if self.storage:
+                    store_res = self._storage_step(cached, kwargs)
+                    if store_res.is_err():
+                        return store_res
+                return self._finish(cached, start_ns)
             
             # --- STEP 1: ALIGNMENT ---
             # Dict[str, LazyFrame] -> LazyFrame
-            align_res = self._execute_alignment(assets, kwargs)
+            if skip_alignment:
+                logger.debug("Skipping alignment (Pass-through)")
+                self._log_step("alignment", "skipped", 0)
+                align_res = Ok(next(iter(assets.values())))
+            else:
+                align_res = self._execute_alignment(assets, kwargs)
             if align_res.is_err():
                 return align_res # Fail Fast
             
-            current_data = align_res.unwrap()
-            
-            # --- STEP 2: VALIDATION ---
-            # LazyFrame -> LazyFrame
-            if self.validator:
-                valid_res = self._execute_validation(current_data, kwargs)
-                if valid_res.is_err():
-                    return valid_res # Fail Fast
-                current_data = valid_res.unwrap()
-            
-            # --- STEP 3: TRANSFORMATIONS ---
-            # LazyFrame -> LazyFrame
-            if self.transformers:
-                transform_res = self._execute_transformations(current_data, kwargs)
-                if transform_res.is_err():
-                    return transform_res
-                current_data = transform_res.unwrap()
-            
-            # --- STEP 4: STORAGE (Side Effect) ---
-            # LazyFrame -> Path (String)
-            if self.storage:
-                # Storage tidak menghentikan pipeline jika gagal (opsional, bisa diubah policy-nya)
-                self._execute_storage(current_data, kwargs)
-            
-            # --- FINISH ---
-            elapsed = time.time() - start_time
-            self._execution_stats.update({
-                "end_time": time.time(),
-                "elapsed_seconds": elapsed,
-                "status": "success"
-            })
-            
-            logger.info(f"Pipeline Completed in {elapsed:.2f}s. Steps: {len(self._steps_log)}")
-            
-            self._last_result = Ok(current_data)
-            return self._last_result
+            res = self._run_post_alignment(align_res.unwrap(), kwargs, start_ns)
+            if cache_key is not None and res.is_ok():
+                # Keep the input frames alive: the key holds their id()s
+                self._result_cache[cache_key] = (tuple(assets.values()), res.unwrap())
+                if len(self._result_cache) > _RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+            return res
             
         except Exception as e:
-            error_msg = f"Pipeline Critical Crash: {str(e)}"
-            logger.critical(error_msg, exc_info=True)
-            self._last_result = Err(error_msg)
-            return self._last_result
+            return self._crash(e)
     
     def execute_single_asset(
         self, 
@@ -129,160 +308,674 @@ class StandardPipeline:
         **kwargs: Any
     ) -> 'Result[pl.LazyFrame, str]':
         """Execute pipeline for single asset (Bypassing Alignment logic)."""
-        # Wrap single asset to dict to reuse logic, but instruct aligner to skip/passthrough if supported
-        # Or implicitly handled by _execute_alignment logic below
-        assets = {"single_asset": data}
-        kwargs["skip_alignment"] = True
-        return self.execute_multi_asset(assets, **kwargs)
+        # Fast path: no dict wrap / skip_alignment round-trip through execute_multi_asset
+        start_ns = self._reset_run_state()
+        self._log_step("alignment", "skipped", 0)
+
+        try:
+            return self._run_post_alignment(data, kwargs, start_ns)
+        except Exception as e:
+            return self._crash(e)
+
+    def _compose_stages(self) -> Tuple[_StageFn, ...]:
+        """
+        Post-alignment steps bound ONCE for this pipeline shape (fixed at construction
+        and add_step). Each step is (LazyFrame, kwargs) -> Result[LazyFrame, str].
+        """
+        steps: List[_StageFn] = []
+        if self.validator:
+            steps.append(self._execute_validation)
+        if self.transformers:
+            steps.append(self._execute_transformations)
+        if self.storage:
+            steps.append(self._storage_step)
+        return tuple(steps)
+
+    def _result_cache_key(self, assets: Dict, skip_alignment: bool, kwargs: Dict) -> Optional[Tuple]:
+        """Fingerprint of one run, or None when kwargs are unhashable (no caching)."""
+        if len(self._transformer_names) != len(self.transformers):
+            # List mutated directly (bypassing add_step): resync the name column
+            self._transformer_names = [type(tf).__name__ for tf in self.transformers]
+        try:
+            return (
+                tuple((name, id(lf)) for name, lf in sorted(assets.items(), key=lambda kv: kv[0])),
+                tuple(
+                    (tf_name, getattr(tf, "config_hash", id(tf)))
+                    for tf_name, tf in zip(self._transformer_names, self.transformers)
+                ),
+                skip_alignment,
+                hash(frozenset(kwargs.items())),
+            )
+        except TypeError:
+            return None
+
+    def _reset_run_state(self) -> int:
+        for column in (self._step_names, self._step_status, self._step_elapsed_ns, self._step_errors, self._step_extra):
+            column.clear()
+        start_ns = perf_counter_ns()
+        self._execution_stats = {"start_ns": start_ns}
+        return start_ns
+
+    def _run_post_alignment(
+        self,
+        current_data: pl.LazyFrame,
+        kwargs: Dict,
+        start_ns: int
+    ) -> 'Result[pl.LazyFrame, str]':
+        """Validate -> transform -> store -> finish (shared by both entry points)."""
+        # Exactly the configured steps; a bare aligner pipeline loops zero times
+        for step in self._post_stages:
+            res = step(current_data, kwargs)
+            if res.is_err():
+                return res
+            current_data = res.unwrap()
+        return self._finish(current_data, start_ns)
+
+    def _finish(self, current_data: pl.LazyFrame, start_ns: int) -> 'Result[pl.LazyFrame, str]':
+        """Record run stats and the final result (pipeline run or cache hit)."""
+        elapsed_ns = perf_counter_ns() - start_ns
+        elapsed = elapsed_ns / 1e9
+        self._execution_stats.update({
+            "elapsed_ns": elapsed_ns,
+            "elapsed_seconds": elapsed,
+            "status": "success"
+        })
+        
+        logger.info("Pipeline Completed in %.2fs. Steps: %d", elapsed, len(self._step_names))
+        
+        self._last_result = Ok(current_data)
+        return self._last_result
+
+    def _crash(self, e: Exception) -> 'Result[pl.LazyFrame, str]':
+        error_msg = f"Pipeline Critical Crash: {str(e)}"
+        logger.critical(error_msg, exc_info=True)
+        self._last_result = Err(error_msg)
+        return self._last_result
     
+    async def execute_multi_asset_async(
+        self,
+        batches: List[Dict[str, pl.LazyFrame]],
+        **kwargs: Any
+    ) -> List['Result[pl.DataFrame, str]']:
+        """
+        Run many independent asset batches (e.g. one per day/universe) as a 2-stage
+        queue pipeline: [plan: align -> validate -> transform] -> [collect].
+        Batch i+1 is planned (aligner/validator do eager work there) while batch i
+        is collected. Planning runs on a thread pool, collection via collect_async;
+        queues are bounded so at most `queue_size` plans wait in memory.
+        Results keep the input order. Storage (if any) runs inside the plan stage.
+        """
+
+        max_workers = kwargs.pop("max_workers", 2)
+        queue_size = kwargs.pop("queue_size", 2)
+
+        loop = asyncio.get_running_loop()
+        q_plans: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        results: List[Any] = [None] * len(batches)
+
+        async def _collect(lf: pl.LazyFrame) -> 'Result[pl.DataFrame, str]':
+            # collect_async runs on Polars' own pool and resolves on this loop:
+            # no executor thread is parked while the engine works
+            try:
+                return Ok(await lf.collect_async())
+            except Exception as e:
+                return Err(f"Collect Crash: {e}")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            async def plan_stage():
+                # Sequential on purpose: execute_multi_asset owns the step log
+                for idx, assets in enumerate(batches):
+                    res = await loop.run_in_executor(
+                        pool, functools.partial(self.execute_multi_asset, assets, **kwargs)
+                    )
+                    await q_plans.put((idx, res))
+                await q_plans.put(_SENTINEL)
+
+            async def collect_stage():
+                while (item := await q_plans.get()) is not _SENTINEL:
+                    idx, res = item
+                    if res.is_err():
+                        results[idx] = res
+                        continue
+                    results[idx] = await _collect(res.unwrap())
+
+            await asyncio.gather(plan_stage(), collect_stage())
+
+        return results
+
+    def execute_batches(
+        self,
+        batches: List[Dict[str, pl.LazyFrame]],
+        **kwargs: Any
+    ) -> List['Result[pl.DataFrame, str]']:
+        """Sync wrapper over execute_multi_asset_async (not for use inside a running loop)."""
+        return asyncio.run(self.execute_multi_asset_async(batches, **kwargs))
+
+    def wait_for_storage(self, timeout: Optional[float] = None) -> 'Result[str, str]':
+        """
+        Block until the last background storage write finishes (durability point)
+        and record its outcome in the step log. After a sync_storage=True run (or a
+        second wait) this returns the last storage result directly.
+        """
+        if self._storage_future is None:
+            return self._last_storage_result or Err("No storage write pending")
+
+        t0 = perf_counter_ns()
+        try:
+            res = self._storage_future.result(timeout=timeout)
+        except FutureTimeout as e:
+            # Still running: keep the future so the caller can wait again
+            return Err(f"Storage Wait Failed: {e}")
+        except Exception as e:
+            res = Err(f"Storage Wait Failed: {e}")
+
+        self._storage_future = None
+        self._last_storage_result = res
+        if res.is_ok():
+            self._log_step("storage", "success", perf_counter_ns() - t0, path=res.unwrap())
+        else:
+            self._log_step("storage", "failed", perf_counter_ns() - t0, error=res.error)
+        return res
+
+    def execute_batch(
+        self,
+        assets_list: List[Dict[str, pl.LazyFrame]],
+        **kwargs: Any
+    ) -> List['Result[pl.DataFrame, str]']:
+        """
+        Plan every asset dict first (no collect), then materialize with ONE
+        pl.collect_all per chunk of `batch_size` plans (default/cap 64): the
+        optimizer runs once per chunk and all cores work across assets.
+        With storage and `storage_destinations` (exactly one path per entry, else every
+        entry is an Err) every collected frame is then written through the normal
+        storage path (_write_storage: sink format/compression/row groups, save_batched
+        or save), so each plan runs once.
+        Writes happen inside the storage's `deferred_writes()` scope when it has one.
+        The step log reflects the last planned entry only.
+        """
+        batch_size = min(max(1, kwargs.pop("batch_size", _MAX_COLLECT_BATCH)), _MAX_COLLECT_BATCH)
+        destinations = kwargs.pop("storage_destinations", None)
+        if destinations is not None and len(destinations) != len(assets_list):
+            # Fail fast, before any planning: one Err per entry keeps the Result contract
+            msg = f"Batch Error: {len(destinations)} storage_destinations for {len(assets_list)} asset entries"
+            logger.error(msg)
+            return [Err(msg) for _ in assets_list]
+        plan_kwargs = {**kwargs, "skip_storage": True}
+
+        results: List[Any] = [self.execute_multi_asset(assets, **plan_kwargs) for assets in assets_list]
+        planned = [i for i, res in enumerate(results) if res.is_ok()]
+
+        store = self.storage is not None and destinations is not None
+
+        # Storage with deferred_writes() (e.g. a metadata registry) commits its
+        # bookkeeping once for the whole batch instead of once per asset
+        defer = getattr(self.storage, "deferred_writes", None) if store else None
+        with (defer() if defer is not None else contextlib.nullcontext()):
+            for start in range(0, len(planned), batch_size):
+                chunk = planned[start:start + batch_size]
+                try:
+                    frames = pl.collect_all([results[i].unwrap() for i in chunk])
+                except Exception as e:
+                    for i in chunk:
+                        results[i] = Err(f"Batch Collect Crash: {e}")
+                    continue
+
+                for i, df in zip(chunk, frames):
+                    results[i] = Ok(df)
+                    if store:
+                        # Failures are logged by _write_storage and never fail the batch entry
+                        self._write_storage(df.lazy(), destinations[i], kwargs)
+
+        return results
+
+    def get_execution_stats(self) -> 'MappingProxyType[str, Any]':
+        """
+        Read-only, zero-copy view of the last run's stats (polled by monitoring).
+        Each run binds a fresh dict, so a view held across runs keeps its run's numbers.
+        """
+        return MappingProxyType(self._execution_stats)
+
+    def get_last_result(self) -> Optional['Result[pl.LazyFrame, str]']:
+        return self._last_result
+
     def get_step_names(self) -> List[str]:
-        return [step["name"] for step in self._steps_log]
+        return list(self._step_names)
+
+    def get_steps(self) -> List[Dict[str, Any]]:
+        """Audit trail as dicts (built on demand, not per step). `elapsed` in seconds."""
+        steps = []
+        for name, status, elapsed_ns, error, extra in zip(
+            self._step_names, self._step_status, self._step_elapsed_ns, self._step_errors, self._step_extra
+        ):
+            entry = {"name": name, "status": status, "elapsed": elapsed_ns / 1e9}
+            if error is not None:
+                entry["error"] = error
+            if extra:
+                entry.update(extra)
+            steps.append(entry)
+        return steps
+
+    def get_steps_frame(self) -> pl.DataFrame:
+        """Audit trail as a typed DataFrame (name, status, elapsed_ns, error) for timing analytics."""
+        return pl.DataFrame(
+            {
+                "name": list(self._step_names),
+                "status": list(self._step_status),
+                "elapsed_ns": list(self._step_elapsed_ns),
+                "error": list(self._step_errors),
+            },
+            schema={"name": pl.Utf8, "status": pl.Utf8, "elapsed_ns": pl.Int64, "error": pl.Utf8},
+        )
 
     # ====================== INTERNAL STEPS ======================
     
     def _execute_alignment(self, assets: Dict, kwargs: Dict) -> 'Result[pl.LazyFrame, str]':
-        from ..shared import Ok, Err
-        t0 = time.time()
-        
-        # Check Bypass
-        if kwargs.get("skip_alignment"):
-            logger.debug("Skipping alignment (Pass-through)")
-            self._log_step("alignment", "skipped", 0)
-            return Ok(next(iter(assets.values())))
+        t0 = perf_counter_ns()
 
-        try:
-            res = self.aligner.align(assets, **kwargs)
-            if res.is_ok():
-                self._log_step("alignment", "success", time.time() - t0, method=self.aligner.method)
-                return res
-            else:
-                self._log_step("alignment", "failed", time.time() - t0, error=res.error)
-                return res
-        except Exception as e:
-            return Err(f"Alignment Crash: {e}")
+        # stack_assets=True: one stacked (symbol-tagged) frame + one asof scan instead of
+        # N follower joins. Explicit join_engine wins; aligners without engines ignore it.
+        if kwargs.get("stack_assets") and "join_engine" not in kwargs:
+            kwargs = {**kwargs, "join_engine": "asof_by"}
+
+        if kwargs.get("prefetch_assets"):
+            assets = self._prefetch_assets(assets, kwargs)
+        res = self.aligner.align(assets, **kwargs)
+        if res.is_ok():
+            self._log_step("alignment", "success", perf_counter_ns() - t0, method=self.aligner.method)
+            return res
+        else:
+            self._log_step("alignment", "failed", perf_counter_ns() - t0, error=res.error)
+            return res
+
+    @staticmethod
+    def _prefetch_assets(assets: Dict, kwargs: Dict) -> Dict:
+        """
+        Materialize cold asset scans (scan_parquet) concurrently before alignment.
+        collect_all runs a wave of plans in parallel; waves are capped at
+        `prefetch_width` (default: CPU count) so disk queues do not thrash.
+        """
+        names = list(assets)
+        width = max(1, kwargs.get("prefetch_width") or min(len(names), os.cpu_count() or 1))
+        warmed: Dict[str, pl.LazyFrame] = {}
+        for i in range(0, len(names), width):
+            wave = names[i:i + width]
+            for name, df in zip(wave, pl.collect_all([assets[n] for n in wave])):
+                warmed[name] = df.lazy()
+        return warmed
 
     def _execute_validation(self, data: pl.LazyFrame, kwargs: Dict) -> 'Result[pl.LazyFrame, str]':
-        from ..shared import Ok, Err
-        t0 = time.time()
+        t0 = perf_counter_ns()
         
         # Check Bypass
         if kwargs.get("skip_validation"):
             self._log_step("validation", "skipped", 0)
             return Ok(data)
 
-        try:
-            # Ambil rules spesifik dari kwargs jika ada
-            rules_override = kwargs.get("validation_rules")
-            
-            res = self.validator.validate(data, rules_override)
-            
-            if res.is_ok():
-                # Jika validator punya summary, kita log
-                summary = getattr(self.validator, "get_validation_summary", lambda: {})()
-                self._log_step("validation", "success", time.time() - t0, summary=summary)
-                return res
-            else:
-                self._log_step("validation", "failed", time.time() - t0, error=res.error)
-                return res
-        except Exception as e:
-            return Err(f"Validation Crash: {e}")
+        # Ambil rules spesifik dari kwargs jika ada
+        rules_override = kwargs.get("validation_rules")
+        if rules_override is None and self._schema_verified:
+            rules_override = _SCHEMA_VERIFIED_RULES
+
+        # lazy_validation=True: checks become filter predicates inside the plan
+        # (no separate scan; failures raise at the terminal collect)
+        if kwargs.get("lazy_validation") and self._validator_exprs_fn is not None:
+            return self._execute_lazy_validation(data, rules_override, t0)
+        
+        res = self.validator.validate(data, rules_override)
+        
+        if res.is_ok():
+            # Jika validator punya summary, kita log
+            summary = self._validator_summary_fn() if self._validator_summary_fn else {}
+            self._log_step("validation", "success", perf_counter_ns() - t0, summary=summary)
+            return res
+        else:
+            self._log_step("validation", "failed", perf_counter_ns() - t0, error=res.error)
+            return res
+
+    def _execute_lazy_validation(
+        self, data: pl.LazyFrame, rules_override: Optional[Dict[str, Any]], t0: int
+    ) -> 'Result[pl.LazyFrame, str]':
+        exprs_res = self._validator_exprs_fn(data.collect_schema(), rules_override)
+        if exprs_res.is_err():
+            self._log_step("validation", "failed", perf_counter_ns() - t0, error=exprs_res.error)
+            return exprs_res
+
+        exprs = exprs_res.unwrap()
+        self._log_step("validation", "deferred", perf_counter_ns() - t0, checks=len(exprs))
+        return Ok(data.filter(*exprs) if exprs else data)
 
     def _execute_transformations(self, data: pl.LazyFrame, kwargs: Dict) -> 'Result[pl.LazyFrame, str]':
-        from ..shared import Ok, Err
-        t0 = time.time()
+        """
+        Apply transformers in order. Runs of consecutive transformers exposing
+        `independent_exprs(schema_cols)` are fused into ONE with_columns (Polars
+        evaluates the expressions in parallel inside that node). Consecutive
+        transformers flagged `independent = True` (read only pre-existing columns,
+        append new ones, keep every row) run as parallel branches of the same plan
+        and are stitched back with a lazy horizontal concat; anything else runs serially.
+        """
+        t0 = perf_counter_ns()
         current = data
+        if not _PIPELINE_KWARGS.isdisjoint(kwargs):
+            kwargs = {k: v for k, v in kwargs.items() if k not in _PIPELINE_KWARGS}
         
-        for idx, tf in enumerate(self.transformers):
-            try:
-                # Transform
-                res = tf.transform(current, **kwargs)
-                if res.is_err():
-                    self._log_step("transformation", "failed", time.time() - t0, transformer=type(tf).__name__)
-                    return Err(f"Transformer {type(tf).__name__} failed: {res.error}")
-                
-                current = res.unwrap()
-                
-            except Exception as e:
-                return Err(f"Transformer Crash: {e}")
+        # Satu try untuk seluruh loop: helper raise _TransformFailed, Result hanya di boundary
+        try:
+            for kind, group in self._transform_groups():
+                if kind == _RUN_EXPRS:
+                    current = self._apply_expr_group(group, current, kwargs, t0)
+                elif len(group) == 1:
+                    current = self._apply_transformer(group[0], current, kwargs, t0)
+                else:
+                    current = self._apply_independent_group(group, current, kwargs, t0)
+        except _TransformFailed as e:
+            return Err(str(e))
 
-        self._log_step("transformation", "success", time.time() - t0, count=len(self.transformers))
+        self._log_step("transformation", "success", perf_counter_ns() - t0, count=len(self.transformers))
         return Ok(current)
 
+    def _transform_groups(self) -> Tuple[Tuple[str, Tuple[_BoundTransformer, ...]], ...]:
+        """
+        Cached run plan: grouping (getattr probes + thread-pool check) happens once,
+        not per execute. Each entry carries its bound transform/requires_materialization
+        methods and class name. Rebuilt after add_step or when the list length changes.
+        """
+        if self._transform_plan is None or self._transform_plan_len != len(self.transformers):
+            self._transform_plan = tuple(
+                (kind, tuple(
+                    _BoundTransformer(tf, type(tf).__name__, tf.transform, getattr(tf, "requires_materialization", None))
+                    for tf in group
+                ))
+                for kind, group in self._group_transformers()
+            )
+            self._transform_plan_len = len(self.transformers)
+        return self._transform_plan
+
+    def _group_transformers(self) -> List[Tuple[str, List['FeatureTransformer']]]:
+        """
+        Split transformers into (kind, run) pairs. Consecutive expression providers
+        share an _RUN_EXPRS run; consecutive independent ones share an _RUN_BRANCH run
+        (only with >= 2 Polars threads: single-threaded branches gain nothing).
+        """
+        parallel = pl.thread_pool_size() >= 2
+        groups: List[Tuple[str, List['FeatureTransformer']]] = []
+        for tf in self.transformers:
+            if callable(getattr(tf, "independent_exprs", None)):
+                kind = _RUN_EXPRS
+            elif parallel and getattr(tf, "independent", False):
+                kind = _RUN_BRANCH
+            else:
+                kind = _RUN_SERIAL
+
+            if kind != _RUN_SERIAL and groups and groups[-1][0] == kind:
+                groups[-1][1].append(tf)
+            else:
+                groups.append((kind, [tf]))
+        return groups
+
+    def _apply_expr_group(
+        self, group: Tuple[_BoundTransformer, ...], current: pl.LazyFrame, kwargs: Dict, t0: int
+    ) -> pl.LazyFrame:
+        """Fuse: every provider's expressions go into a single with_columns node."""
+        schema_cols = current.collect_schema().names()
+        exprs: List[pl.Expr] = []
+        serial: List[_BoundTransformer] = []
+        for step in group:
+            tf_exprs = step.tf.independent_exprs(schema_cols)
+            if tf_exprs is None:
+                # Provider declined for this input -> regular transform() after the fused node
+                serial.append(step)
+            else:
+                exprs.extend(tf_exprs)
+
+        names = [e.meta.output_name() for e in exprs]
+        if len(names) != len(set(names)):
+            # Output clash: not independent after all -> serial, in order
+            logger.warning("Fused transformers share output columns. Running serially.")
+            serial = list(group)
+            exprs = []
+
+        if exprs:
+            current = current.with_columns(exprs)
+        for step in serial:
+            current = self._apply_transformer(step, current, kwargs, t0)
+        return current
+
+    def _apply_transformer(
+        self, step: _BoundTransformer, current: pl.LazyFrame, kwargs: Dict, t0: int
+    ) -> pl.LazyFrame:
+        """Run one transformer; raises _TransformFailed instead of returning Err."""
+        _, name, transform, needs_data = step
+        # Explicit plan break: a transformer that needs real data (eager kernel,
+        # data-dependent schema) opts in via requires_materialization() -> True
+        if needs_data is not None and needs_data():
+            current = current.collect().lazy()
+
+        # Transform (exact type check: Ok is final, skips two method calls)
+        res = transform(current, **kwargs)
+        if type(res) is not Ok:
+            self._log_step("transformation", "failed", perf_counter_ns() - t0, transformer=name)
+            raise _TransformFailed(f"Transformer {name} failed: {res.error}")
+        
+        out = res.value
+        if not isinstance(out, pl.LazyFrame):
+            # Materialized frame = broken single-plan contract
+            error = (
+                f"Transformer {name} returned {type(out).__name__}, "
+                "expected LazyFrame (transformers must not collect)"
+            )
+            self._log_step("transformation", "failed", perf_counter_ns() - t0, error=error)
+            raise _TransformFailed(error)
+        return out
+
+    def _apply_independent_group(
+        self, group: Tuple[_BoundTransformer, ...], current: pl.LazyFrame, kwargs: Dict, t0: int
+    ) -> pl.LazyFrame:
+        """Fan-out: every branch starts from `current`; only new columns are kept."""
+        base_cols = set(current.collect_schema().names())
+        branches: List[pl.LazyFrame] = []
+        seen: set = set()
+
+        for step in group:
+            branch = self._apply_transformer(step, current, kwargs, t0)
+            new_cols = [c for c in branch.collect_schema().names() if c not in base_cols]
+
+            if seen.intersection(new_cols):
+                # Output clash: branches are not independent after all -> serial
+                logger.warning("Independent transformers share output columns. Running serially.")
+                for step_serial in group:
+                    current = self._apply_transformer(step_serial, current, kwargs, t0)
+                return current
+
+            seen.update(new_cols)
+            branches.append(branch.select(new_cols))
+
+        return pl.concat([current, *branches], how="horizontal")
+
+    def _storage_step(self, data: pl.LazyFrame, kwargs: Dict) -> 'Result[pl.LazyFrame, str]':
+        # Storage tidak menghentikan pipeline jika gagal (side effect only)
+        if not kwargs.get("skip_storage"):
+            self._execute_storage(data, kwargs)
+        return Ok(data)
+
     def _execute_storage(self, data: pl.LazyFrame, kwargs: Dict) -> None:
         """
         Executes storage. 
         IMPORTANT: We pass LazyFrame directly. We do NOT collect() here.
         Let the Storage Implementation decide (Sink vs Collect).
+        Storage with `sinkable = True` (or `supports_streaming_sink = True`) is
+        streamed straight to parquet/IPC (no collect); storage exposing
+        `save_batched(batch, destination)` receives row-group sized DataFrames.
+        Default: the write is submitted to the background pool and this returns
+        immediately (see wait_for_storage). `sync_storage=True` writes inline.
         """
-        t0 = time.time()
+        t0 = perf_counter_ns()
         destination = kwargs.get("storage_destination", "pipeline_output")
-        
+
+        if not kwargs.get("sync_storage", False):
+            self._storage_future = self._STORAGE_POOL.submit(
+                self._write_storage, data, destination, kwargs
+            )
+            # Failures surface in the log as soon as they happen, not only via wait_for_storage
+            self._storage_future.add_done_callback(_report_background_storage)
+            self._log_step("storage", "submitted", perf_counter_ns() - t0, path=destination)
+            return
+
+        res = self._write_storage(data, destination, kwargs)
+        self._storage_future = None
+        self._last_storage_result = res
+        if res.is_ok():
+            self._log_step("storage", "success", perf_counter_ns() - t0, path=res.unwrap())
+        else:
+            self._log_step("storage", "failed", perf_counter_ns() - t0, error=res.error)
+
+    def _write_storage(self, data: pl.LazyFrame, destination: str, kwargs: Dict) -> 'Result[str, str]':
+        # Runs on the caller thread (sync) or a pool thread: must not touch the step log
         try:
+            storage = self.storage
+            if getattr(storage, "sinkable", False) or getattr(storage, "supports_streaming_sink", False):
+                self._sink(data, destination, kwargs.get("streaming_chunk_size"))
+                return Ok(destination)
+
+            save_batched = getattr(storage, "save_batched", None)
+            if save_batched is not None:
+                # Row-group sized batches straight from the engine: never the full frame
+                chunk = kwargs.get("streaming_chunk_size") or _DEFAULT_ROW_GROUP
+                rows = 0
+                for batch in data.collect_batches(chunk_size=chunk):
+                    res = save_batched(batch, destination)
+                    if res.is_err():
+                        logger.warning(f"Storage failed: {res.error}")
+                        return res
+                    rows += batch.height
+                logger.debug("Stored %d rows in batches of %d", rows, chunk)
+                return Ok(destination)
+
             # Storage save mengembalikan Result[str, str] (Path)
-            res = self.storage.save(data, destination, **kwargs)
-            
-            if res.is_ok():
-                self._log_step("storage", "success", time.time() - t0, path=res.unwrap())
-            else:
+            res = storage.save(data, destination, **kwargs)
+            if res.is_err():
                 logger.warning(f"Storage failed: {res.error}")
-                self._log_step("storage", "failed", time.time() - t0, error=res.error)
+            return res
                 
         except Exception as e:
             logger.error(f"Storage Crash: {e}")
+            return Err(f"Storage Crash: {e}")
+
+    @staticmethod
+    def _sink(data: pl.LazyFrame, destination: str, chunk: Optional[int]) -> None:
+        """
+        Stream the plan straight to disk (no Python-side DataFrame).
+        .arrow/.ipc/.feather -> sink_ipc, anything else -> zstd parquet with row
+        groups of `chunk` rows. An explicit chunk also sizes the engine's morsels
+        for this write only (no process-wide Config change).
+        """
+        if destination.endswith((".arrow", ".ipc", ".feather")):
+            write = functools.partial(data.sink_ipc, destination, engine="streaming")
+        else:
+            write = functools.partial(
+                data.sink_parquet, destination, compression="zstd",
+                row_group_size=chunk or _DEFAULT_ROW_GROUP, engine="streaming"
+            )
+
+        if chunk:
+            with pl.Config(streaming_chunk_size=chunk):
+                write()
+        else:
+            write()
 
-    def _log_step(self, name: str, status: str, elapsed: float, **info):
-        entry = {
-            "name": name,
-            "status": status,
-            "elapsed": elapsed,
-            **info
-        }
-        self._steps_log.append(entry)
+    def _log_step(self, name: str, status: str, elapsed_ns: int, error: Optional[str] = None, **info):
+        # Names/statuses are a tiny fixed vocabulary -> interned
+        self._step_names.append(sys.intern(name))
+        self._step_status.append(sys.intern(status))
+        self._step_elapsed_ns.append(elapsed_ns)
+        self._step_errors.append(error)
+        self._step_extra.append(info or None)
         if status == "failed":
-            logger.error(f"Step {name} Failed: {info.get('error')}")
-        elif status == "success":
-            logger.debug(f"Step {name} OK ({elapsed:.3f}s)")
+            logger.error(f"Step {name} Failed: {error}")
+        elif status == "success" and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Step %s OK (%.3fs)", name, elapsed_ns / 1e9)
+
+
+def _report_background_storage(future: Future) -> None:
+    """Done-callback on the writer thread: log failed background saves."""
+    try:
+        res = future.result()
+    except Exception as e:
+        logger.error("Background storage crashed: %s", e)
+        return
+    if res.is_err():
+        logger.error("Background storage failed: %s", res.error)
 
 
 # ====================== FACTORY ======================
 
+# (protocol, component class) pairs that already passed the Protocol check.
+# runtime_checkable isinstance() inspects every protocol member on every call;
+# per-class memo means any NEW combination of known classes is also free.
+_VERIFIED_CLASSES: set = set()
+
+def _conforms(obj: Any, protocol: Any) -> bool:
+    key = (protocol, type(obj))
+    if key in _VERIFIED_CLASSES:
+        return True
+    if isinstance(obj, protocol):
+        _VERIFIED_CLASSES.add(key)
+        return True
+    return False
+
 def create_standard_pipeline(
     aligner: 'TimeSeriesAligner',
     validator: Optional['DataValidator'] = None,
     transformers: Optional[List['FeatureTransformer']] = None,
-    storage: Optional['RefineryStorage'] = None
+    storage: Optional['RefineryStorage'] = None,
+    expected_schema: Optional[Dict[str, Any]] = None
 ) -> 'Result[StandardPipeline, str]':
     """
     Safe Factory for Pipeline. Ensures all components comply with Protocols.
+    Each Protocol check runs once per component class (see _conforms).
+    `expected_schema` (post-alignment {column: dtype}) is verified here once,
+    see StandardPipeline.bind_expected_schema.
     """
-    from ..shared import Ok, Err
-    from .protocols import TimeSeriesAligner, DataValidator, FeatureTransformer, RefineryStorage
 
     try:
         # 1. Check Aligner (Mandatory)
-        if not isinstance(aligner, TimeSeriesAligner):
+        if not _conforms(aligner, TimeSeriesAligner):
             return Err(f"Aligner must implement TimeSeriesAligner, got {type(aligner)}")
 
         # 2. Check Validator
-        if validator and not isinstance(validator, DataValidator):
+        if validator and not _conforms(validator, DataValidator):
             return Err(f"Validator must implement DataValidator, got {type(validator)}")
 
         # 3. Check Transformers
         if transformers:
             for tf in transformers:
-                if not isinstance(tf, FeatureTransformer):
+                if not _conforms(tf, FeatureTransformer):
                     return Err(f"Invalid Transformer: {type(tf)}")
 
         # 4. Check Storage
-        if storage and not isinstance(storage, RefineryStorage):
+        if storage and not _conforms(storage, RefineryStorage):
             return Err(f"Storage must implement RefineryStorage, got {type(storage)}")
 
-        return Ok(StandardPipeline(aligner, validator, transformers, storage))
+        return _build_pipeline(aligner, validator, transformers, storage, expected_schema)
 
     except Exception as e:
         return Err(f"Pipeline Factory Error: {e}")
 
 
+def _build_pipeline(
+    aligner: 'TimeSeriesAligner',
+    validator: Optional['DataValidator'],
+    transformers: Optional[List['FeatureTransformer']],
+    storage: Optional['RefineryStorage'],
+    expected_schema: Optional[Dict[str, Any]]
+) -> 'Result[StandardPipeline, str]':
+    pipeline = StandardPipeline(aligner, validator, transformers, storage)
+    if expected_schema is not None:
+        bind_res = pipeline.bind_expected_schema(expected_schema)
+        if bind_res.is_err():
+            return bind_res
+    return Ok(pipeline)
+
+
 # ====================== EXPORTS ======================
 __all__ = ["StandardPipeline", "create_standard_pipeline"]
 
@@ -314,3 +1007,5 @@ def _test_pipeline_wiring():
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
     _test_pipeline_wiring()
+elif os.environ.get("STATARB_SELFTEST"):
+    _test_pipeline_wiring()
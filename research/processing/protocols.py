@@ -42,7 +42,12 @@ class DataValidator(Protocol):
 
 @runtime_checkable
 class FeatureTransformer(Protocol):
-    """Contract for Feature Engineering."""
+    """
+    Contract for Feature Engineering.
+    transform() must return a LazyFrame and must NOT call .collect(): the pipeline
+    chains every transformer into one plan and materializes it once at the end.
+    A transformer that really needs data opts in with requires_materialization().
+    """
     def transform(self, data: pl.LazyFrame, features: Optional[List[str]] = None) -> 'Result[pl.LazyFrame, str]':
         ...
     @property
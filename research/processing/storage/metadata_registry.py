@@ -4,12 +4,17 @@ Focus: Schema validation, Feature Hashing, and Storage bookkeeping.
 Location: research/processing/storage/metadata_registry.py
 Paradigm: Composition & Type Discipline
 """
+import functools
 import json
 import logging
 import hashlib
+import os
+import re
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 
 # Type-safe imports
 from typing import TYPE_CHECKING
@@ -20,6 +25,51 @@ from ...shared import Ok, Err
 
 logger = logging.getLogger("MetadataRegistry")
 
+# Hash cache evicts least-recently-used entries instead of refusing new ones
+_HASH_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=_HASH_CACHE_SIZE)
+def _hash_bytes(config_bytes: bytes) -> str:
+    """SHA-256 hex digest (OpenSSL backend; integrity fingerprint, not a security use)."""
+    return hashlib.new("sha256", config_bytes, usedforsecurity=False).hexdigest()
+
+
+def _dump_registry(registry_data: Dict[str, Any]) -> bytes:
+    """
+    Registry document as indented UTF-8 bytes. Same encoder and `default=str` as
+    the feature hash, so feature_params loaded back from disk hash identically
+    (numpy scalars stay numbers, datetimes become str(), NaN stays NaN).
+    """
+    return json.dumps(registry_data, indent=2, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _atomic_write(target: Path, payload: bytes) -> None:
+    """
+    Durable replace: raw write of the whole payload + fsync on a uniquely named
+    temp sibling, then os.replace. A crash leaves either the old file or the
+    complete new one; concurrent writers never share a temp file (last replace wins).
+    """
+    fd, temp_name = tempfile.mkstemp(dir=str(target.parent), prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        try:
+            os.fchmod(fd, 0o644)
+            view = memoryview(payload)
+            while view:
+                # os.write may be partial (signals, pipes); normally one syscall
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(temp_name, target)
+    except BaseException:
+        # Never leave orphaned temp files behind
+        try:
+            os.unlink(temp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
 class MetadataRegistry:
     """
     The Notary of Node B.
@@ -38,6 +88,10 @@ class MetadataRegistry:
     
     _FLOAT64_INDICATORS = frozenset(["float64", "f64"])
 
+    # Compiled once: one C-level match per column instead of a Python any() per prefix
+    _SENSITIVE_RE = re.compile("|".join(map(re.escape, sorted(_SENSITIVE_PREFIXES))))
+    _FLOAT64_RE = re.compile("|".join(map(re.escape, sorted(_FLOAT64_INDICATORS))))
+
     def __init__(self, storage_path: str, schema_version: str = "1.0.0"):
         """
         Args:
@@ -47,7 +101,9 @@ class MetadataRegistry:
         self.storage_path = Path(storage_path).resolve()
         self.metadata_file = self.storage_path / "metadata.json"
         self.schema_version = schema_version
-        self._cached_hashes: Dict[str, str] = {}
+        # Deferred writes (see deferred_writes): nesting depth + latest encoded document
+        self._defer_depth = 0
+        self._pending_payload: Optional[bytes] = None
         
         # Ensure storage path exists during initialization
         self.storage_path.mkdir(parents=True, exist_ok=True)
@@ -59,23 +115,12 @@ class MetadataRegistry:
         Prevents stale data bugs by tracking parameter changes across tiers.
         """
         try:
-            # Create deterministic string representation
+            # Create deterministic byte representation (encoded once, reused as cache key)
             # Sort keys is mandatory for hash consistency
-            config_str = json.dumps(config, sort_keys=True, default=str)
-            
-            # Simple runtime cache check
-            if config_str in self._cached_hashes:
-                return self._cached_hashes[config_str]
-            
-            # Generate SHA-256 hash
-            hash_obj = hashlib.sha256(config_str.encode())
-            feature_hash = hash_obj.hexdigest()
-            
-            # Update cache (limited to 100 entries to prevent memory growth)
-            if len(self._cached_hashes) < 100:
-                self._cached_hashes[config_str] = feature_hash
+            config_bytes = json.dumps(config, sort_keys=True, default=str).encode()
             
-            return feature_hash
+            # Generate SHA-256 hash (LRU-cached on the serialized bytes)
+            return _hash_bytes(config_bytes)
             
         except Exception as e:
             logger.error(f"Feature hash generation failed: {str(e)}")
@@ -111,12 +156,13 @@ class MetadataRegistry:
             if additional_metadata:
                 registry_data.update(additional_metadata)
             
-            # Atomic Write Pattern: Write to .tmp then rename
-            temp_file = self.metadata_file.with_suffix('.tmp')
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(registry_data, f, indent=2, ensure_ascii=False)
-            
-            temp_file.replace(self.metadata_file)
+            payload = _dump_registry(registry_data)
+            if self._defer_depth:
+                # Same file every time: only the latest document needs to hit disk
+                self._pending_payload = payload
+            else:
+                # Atomic Write Pattern: Write to .tmp, fsync, then rename
+                _atomic_write(self.metadata_file, payload)
             
             logger.info(
                 f"Registry updated | Rows: {row_count} | Hash: {feature_hash[:8]}"
@@ -127,6 +173,33 @@ class MetadataRegistry:
             logger.error(f"Registry update failed: {str(e)}", exc_info=True)
             return Err(f"Metadata Registry Error: {str(e)}")
 
+    @contextmanager
+    def deferred_writes(self) -> Iterator['MetadataRegistry']:
+        """
+        Coalesce update_registry calls (e.g. one per asset in a batch run) into a
+        single write + fsync + rename when the outermost block exits.
+        """
+        self._defer_depth += 1
+        try:
+            yield self
+        finally:
+            self._defer_depth -= 1
+            if not self._defer_depth:
+                flush_res = self.flush()
+                if flush_res.is_err():
+                    logger.error(flush_res.error)
+
+    def flush(self) -> 'Result[None, str]':
+        """Write the pending deferred document, if any."""
+        payload, self._pending_payload = self._pending_payload, None
+        if payload is None:
+            return Ok(None)
+        try:
+            _atomic_write(self.metadata_file, payload)
+            return Ok(None)
+        except Exception as e:
+            return Err(f"Metadata Registry Error: {str(e)}")
+
     def validate_schema_integrity(self, schema_dict: Dict[str, Any]) -> 'Result[None, str]':
         """
         Enforces strict Float64 for sensitive financial features.
@@ -135,16 +208,12 @@ class MetadataRegistry:
         violations: List[str] = []
         
         for col, dtype in schema_dict.items():
-            # Check if column starts with any sensitive prefix
-            is_sensitive = any(col.startswith(prefix) for prefix in self._SENSITIVE_PREFIXES)
-            
-            if is_sensitive:
+            # Check if column starts with any sensitive prefix (match() is anchored)
+            if self._SENSITIVE_RE.match(col):
                 dtype_str = str(dtype).lower()
                 
-                # Verify if dtype is Float64
-                is_float64 = any(indicator in dtype_str for indicator in self._FLOAT64_INDICATORS)
-                
-                if not is_float64:
+                # Verify if dtype is Float64 (substring, e.g. "float64" inside "Float64")
+                if not self._FLOAT64_RE.search(dtype_str):
                     violations.append(f"{col} ({dtype_str})")
         
         if violations:
@@ -182,7 +251,12 @@ class MetadataRegistry:
                 if registry_res.is_err():
                     return Err(f"Consistency check failed: {registry_res.error}")
                 expected_params = registry_res.unwrap().get("feature_params", {})
-            
+
+            # Same object on both sides (walk-forward re-checks): nothing to hash.
+            # No `==` shortcut: 1 == 1.0 == True, but they serialize (and hash) differently
+            if current_params is expected_params:
+                return Ok(True)
+
             current_hash = self.generate_feature_hash(current_params)
             expected_hash = self.generate_feature_hash(expected_params)
             
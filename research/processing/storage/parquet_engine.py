@@ -1,6 +1,6 @@
 import logging 
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, Any
+from typing import TYPE_CHECKING, ContextManager, Dict, Any
 import polars as pl
 
 if TYPE_CHECKING:
@@ -19,6 +19,10 @@ class ParquetStorageEngine:
         self.base_path.mkdir(parents=True, exist_ok=True)
         logger.debug(f"ParquetEngine initialized at: {self.base_path}")
 
+    def deferred_writes(self) -> ContextManager['MetadataRegistry']:
+        """Batch scope: registry updates from every save inside are written once on exit."""
+        return self.registry.deferred_writes()
+
     def save(self, data: pl.LazyFrame, feature_params: Dict[str, Any]) -> 'Result[str, str]':
         try:
             logger.info("Starting Silver lake storage sequence ...")
@@ -4,7 +4,7 @@ Focus: Converting raw nominal prices into mathematical properties (Log-Space & R
 """
 import logging
 import polars as pl
-from typing import List, Any, Optional
+from typing import Dict, List, Any, Optional
 
 # Type-safe imports
 from typing import TYPE_CHECKING
@@ -46,6 +46,12 @@ class LogReturnsTransformer:
         self.replace_zeros = replace_zeros
         self.epsilon = epsilon
 
+    @property
+    def config_hash(self) -> int:
+        """Hash of the constructor params (pipeline result-cache key)."""
+        targets = tuple(self.target_columns) if self.target_columns is not None else None
+        return hash((type(self).__name__, targets, self.replace_zeros, self.epsilon))
+
     def transform(
         self, 
         data: pl.LazyFrame, 
@@ -106,6 +112,23 @@ class LogReturnsTransformer:
             logger.error(f"LogReturns Calculation Failed: {e}", exc_info=True)
             return Err(f"Transformation Error: {str(e)}")
 
+    def preview_schema(self, schema: Dict[str, Any]) -> 'Result[Dict[str, Any], str]':
+        """Output schema of transform() for an input {column: dtype}, without a plan."""
+        targets = self._identify_targets(list(schema))
+        if not targets:
+            return Err("LogReturns: No target columns found (expected 'close_*')")
+
+        out = dict(schema)
+        for col in targets:
+            base_name = col.replace("close_", "")
+            # log() keeps Float32, everything else (ints included) becomes Float64
+            dtype = pl.Float32 if schema[col] == pl.Float32 else pl.Float64
+            out[f"log_{base_name}"] = dtype
+        for col in targets:
+            base_name = col.replace("close_", "")
+            out[f"ret_{base_name}"] = out[f"log_{base_name}"]
+        return Ok(out)
+
     def _identify_targets(self, available_cols: List[str]) -> List[str]:
         """Resolve target columns against available schema."""
         if self.target_columns:
@@ -21,6 +21,7 @@ class ValidationRules:
         required_columns: List of columns that MUST exist.
         check_sorted: Ensure timestamp is strictly increasing.
         strict_types: Enforce specific data types (Int64/Datetime).
+        validate_schema: Run the schema check (False when the caller pre-verified it).
         
         # Financial Checks
         min_price: Minimum allowed price (prevents negative/zero prices).
@@ -42,6 +43,7 @@ class ValidationRules:
     # Structural Checks
     check_sorted: bool = True
     strict_types: bool = True
+    validate_schema: bool = True
     
     # Financial Logic
     check_ohlc_consistency: bool = True
@@ -1,6 +1,6 @@
 import logging
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import polars as pl
 
 # Type-safe imports
@@ -41,16 +41,18 @@ class PolarsValidator:
         """
         Execute validation pipeline (Schema -> Stats -> Integrity).
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
             # --- STEP 1: PREPARE RULES ---
             active_rules = self._resolve_rules(rules)
             
             # --- STEP 2: SCHEMA CHECK (Metadata only) ---
-            schema_res = self._validate_schema(data, active_rules)
-            if schema_res.is_err():
-                return schema_res
+            # Skipped when the pipeline factory already verified a fixed schema
+            if active_rules.validate_schema:
+                schema_res = self._validate_schema(data, active_rules)
+                if schema_res.is_err():
+                    return schema_res
 
             # --- STEP 3: STATISTICAL CHECK (Triggers Collect) ---
             stats = self._collect_stats(data, active_rules)
@@ -74,10 +76,10 @@ class PolarsValidator:
                     return price_res
 
             # --- FINISH ---
-            elapsed = time.time() - start_time
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
             row_count = stats.get("row_count", 0)
             
-            logger.info(f"Validation Passed: {row_count} rows in {elapsed:.3f}s")
+            logger.info("Validation Passed: %s rows in %.3fs", row_count, elapsed)
             self._update_summary("passed", active_rules, stats, elapsed)
             
             return Ok(data)
@@ -88,6 +90,60 @@ class PolarsValidator:
             self._update_summary("error", self.default_rules, {"error": str(e)}, 0.0)
             return Err(err_msg)
 
+    def as_expressions(
+        self,
+        schema: Dict[str, Any],
+        rules: Optional[Dict[str, Any]] = None
+    ) -> 'Result[List[pl.Expr], str]':
+        """
+        Same rules as validate(), as filter predicates that stay inside the plan.
+        Schema rules run here on `schema` (metadata only). Row/null/sort/price
+        checks become predicates that keep every row or raise at collect time,
+        so validation costs no extra scan. Use with `data.filter(*exprs)`.
+        """
+        try:
+            active_rules = self._resolve_rules(rules)
+            if active_rules.validate_schema:
+                schema_res = self.check_schema(schema, active_rules)
+                if schema_res.is_err():
+                    return schema_res
+
+            cols = set(schema)
+            exprs = [_guard(
+                pl.len() >= active_rules.min_rows,
+                f"Insufficient Data: Got fewer than {active_rules.min_rows} rows"
+            )]
+
+            target_cols = set(active_rules.required_columns) | {"open", "high", "low", "close", "volume"}
+            for col in (c for c in schema if c in target_cols):
+                exprs.append(_guard(
+                    pl.col(col).null_count() <= pl.len() * active_rules.max_null_pct,
+                    f"Data Quality Bad: Column '{col}' has more than "
+                    f"{active_rules.max_null_pct:.1%} nulls"
+                ))
+
+            if active_rules.check_sorted and "timestamp" in cols:
+                exprs.append(_guard(
+                    pl.col("timestamp").cast(pl.Int64).diff().fill_null(0).min() >= 0,
+                    "Integrity Error: Timestamp is not sorted ascending"
+                ))
+
+            if active_rules.check_ohlc_consistency and {"high", "low", "close"} <= cols:
+                exprs.append(_guard(
+                    (pl.col("high") < pl.col("low")).sum() == 0,
+                    "Integrity Error: Found rows where High < Low"
+                ))
+                exprs.append(_guard(
+                    (pl.col("close") <= 0).sum() == 0,
+                    "Integrity Error: Found rows where Price <= 0"
+                ))
+
+            self._update_summary("deferred", active_rules, {}, 0.0)
+            return Ok(exprs)
+
+        except Exception as e:
+            return Err(f"Validator System Error: {e}")
+
     def get_validation_summary(self) -> Dict[str, Any]:
         return self.last_summary.copy()
 
@@ -98,24 +154,32 @@ class PolarsValidator:
             return self.default_rules
         return self.default_rules.with_overrides(**overrides)
 
-    def _validate_schema(self, data: pl.LazyFrame, rules: ValidationRules) -> 'Result[None, str]':
-        try:
-            schema = data.collect_schema()
-            cols = schema.names()
-
-            # Missing Columns
-            missing = [c for c in rules.required_columns if c not in cols]
-            if missing:
-                return Err(f"Schema Mismatch: Missing required columns {missing}")
+    def check_schema(
+        self, 
+        schema: Dict[str, Any], 
+        rules: Optional[ValidationRules] = None
+    ) -> 'Result[None, str]':
+        """Schema rules against a known {column: dtype} mapping (no plan needed)."""
+        rules = rules or self.default_rules
+        cols = list(schema)
+
+        # Missing Columns
+        missing = [c for c in rules.required_columns if c not in cols]
+        if missing:
+            return Err(f"Schema Mismatch: Missing required columns {missing}")
+
+        # Strict Type Check
+        if rules.strict_types and "timestamp" in cols:
+            ts_type = schema["timestamp"]
+            is_valid = (ts_type == pl.Int64 or "Datetime" in str(ts_type))
+            if not is_valid:
+                return Err(f"Type Error: 'timestamp' must be Int64 or Datetime, got {ts_type}")
 
-            # Strict Type Check
-            if rules.strict_types and "timestamp" in cols:
-                ts_type = schema["timestamp"]
-                is_valid = (ts_type == pl.Int64 or "Datetime" in str(ts_type))
-                if not is_valid:
-                    return Err(f"Type Error: 'timestamp' must be Int64 or Datetime, got {ts_type}")
+        return Ok(None)
 
-            return Ok(None)
+    def _validate_schema(self, data: pl.LazyFrame, rules: ValidationRules) -> 'Result[None, str]':
+        try:
+            return self.check_schema(data.collect_schema(), rules)
         except Exception as e:
             return Err(f"Schema Validation Failed: {e}")
 
@@ -218,6 +282,17 @@ class PolarsValidator:
             "stats": stats
         }
 
+def _guard(check: pl.Expr, message: str) -> pl.Expr:
+    """Scalar boolean check -> filter predicate that is True or raises when collected."""
+    def _raise_if_false(s: pl.Series) -> pl.Series:
+        # Null (e.g. min() of an empty frame) counts as a pass, like validate()
+        passed = s.fill_null(True)
+        if not passed.all():
+            raise ValueError(message)
+        return passed
+
+    return check.map_batches(_raise_if_false, return_dtype=pl.Boolean, returns_scalar=True)
+
 # ====================== FACTORY ======================
 
 def create_validator(rules: Optional[Dict[str, Any]] = None) -> 'Result[PolarsValidator, str]':
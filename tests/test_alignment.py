@@ -43,6 +43,11 @@ class TestAlignmentLogic:
             "Logic: Perfect Match  ": self.test_perfect_match,
             "Logic: Latency Match  ": self.test_latency_match,
             "Logic: Out of Tolerance": self.test_out_of_tolerance,
+            "Engine: Asof-By Parity ": self.test_asof_by_parity,
+            "Engine: Searchsorted Parity": self.test_searchsorted_parity,
+            "Engine: Grid Fast Path ": self.test_grid_fast_path,
+            "Tolerance: Week & Sub-ms": self.test_tolerance_units,
+            "Input: Eager DataFrames ": self.test_dataframe_input,
         }
         
         passed_count = 0
@@ -172,6 +177,106 @@ class TestAlignmentLogic:
         doge_val = row["close_DOGE"][0]
         return doge_val is None
 
+    def _engine_parity_map(self) -> dict:
+        """Three symbols with gaps, latency and an extra column (shared by engine parity tests)."""
+        base_time = datetime(2024, 1, 1, 10, 0, 0, tzinfo=timezone.utc)
+        base_ms = int(base_time.timestamp() * 1000)
+
+        data_map = {
+            "BTC": pl.DataFrame({
+                "timestamp": [base_ms + i * 60_000 for i in range(5)],
+                "close": [100.0, 101.0, 102.0, 103.0, 104.0]
+            }).lazy(),
+            "DOGE": pl.DataFrame({
+                "timestamp": [base_ms, base_ms + 90_000, base_ms + 240_000],
+                "close": [50.0, 51.5, 54.0]
+            }).lazy(),
+            "ETH": pl.DataFrame({
+                "timestamp": [base_ms + 120_000, base_ms + 150_000],
+                "close": [7.0, 8.0],
+                "volume": [1.0, 2.0]
+            }).lazy(),
+        }
+        return data_map
+
+    def _engine_matches_loop(self, join_engine: str, strategy: str = "backward") -> bool:
+        data_map = self._engine_parity_map()
+        aligner = get_aligner(method="asof", tolerance="1m", join_strategy=strategy).unwrap()
+        loop_res = aligner.align(data_map, strict=False)
+        engine_res = aligner.align(data_map, strict=False, join_engine=join_engine)
+        if loop_res.is_err() or engine_res.is_err():
+            return False
+
+        df_loop = loop_res.unwrap().collect()
+        df_engine = engine_res.unwrap().collect()
+        return df_engine.columns == df_loop.columns and df_engine.equals(df_loop)
+
+    def test_asof_by_parity(self) -> bool:
+        """Scenario 4: Batched join_asof(by=symbol) must match the per-follower loop."""
+        return self._engine_matches_loop("asof_by")
+
+    def test_searchsorted_parity(self) -> bool:
+        """Scenario 5: numpy searchsorted merge must match the loop (both directions)."""
+        return (
+            self._engine_matches_loop("searchsorted", "backward")
+            and self._engine_matches_loop("searchsorted", "forward")
+        )
+
+    def test_grid_fast_path(self) -> bool:
+        """Scenario 6: A follower on the anchor's exact grid is stitched, not searched."""
+        data_map = self._engine_parity_map()
+        btc = data_map["BTC"].collect()
+        # SOL shares BTC's grid and sits AFTER an off-grid follower (column order check)
+        data_map["SOL"] = btc.with_columns(pl.col("close") * 2).lazy()
+
+        aligner = get_aligner(method="asof", tolerance="1m").unwrap()
+        lazy_res = aligner.align(data_map, strict=False, eager_followers=False)
+        fast_res = aligner.align(data_map, strict=False)
+        if lazy_res.is_err() or fast_res.is_err():
+            return False
+
+        df_lazy = lazy_res.unwrap().collect()
+        df_fast = fast_res.unwrap().collect()
+        return df_fast.columns == df_lazy.columns and df_fast.equals(df_lazy)
+
+    def test_tolerance_units(self) -> bool:
+        """Scenario 7: "1w" parses; "1us" joins on Datetime keys (exact matches only)."""
+        data_map = self._engine_parity_map()
+        week_res = get_aligner(method="asof", tolerance="1w")
+        micro_res = get_aligner(method="asof", tolerance="1us")
+        if week_res.is_err() or micro_res.is_err():
+            return False
+
+        aligner = micro_res.unwrap()
+        res = aligner.align(data_map, strict=False)
+        sorted_res = aligner.align(data_map, strict=False, join_engine="searchsorted")
+        if res.is_err() or sorted_res.is_err():
+            return False
+
+        df = res.unwrap().collect()
+        if df["close_DOGE"].to_list() != [50.0, None, None, None, 54.0]:
+            return False
+        return df.equals(sorted_res.unwrap().collect())
+
+    def _dataframe_input_matches(self, join_engine: str) -> bool:
+        """Eager pl.DataFrame inputs must align exactly like their LazyFrame form."""
+        lazy_map = self._engine_parity_map()
+        eager_map = {sym: lf.collect() for sym, lf in lazy_map.items()}
+        aligner = get_aligner(method="asof", tolerance="1m").unwrap()
+        lazy_res = aligner.align(lazy_map, strict=False, join_engine=join_engine)
+        eager_res = aligner.align(eager_map, strict=False, join_engine=join_engine)
+        if lazy_res.is_err() or eager_res.is_err():
+            logger.error(f"{join_engine}: {eager_res}")
+            return False
+        return eager_res.unwrap().collect().equals(lazy_res.unwrap().collect())
+
+    def test_dataframe_input(self) -> bool:
+        """Scenario 8: DataFrame inputs (accepted by _validate_frame) work on every engine."""
+        return all(
+            self._dataframe_input_matches(engine)
+            for engine in ("join_asof", "asof_by", "searchsorted")
+        )
+
     def print_summary(self, passed, total):
         print("\n" + "="*50)
         print(f"TEST SUMMARY: {passed}/{total} Passed")
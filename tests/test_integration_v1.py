@@ -195,6 +195,15 @@ class IntegrationTestV1:
         btc_val = self.result_df["close_BTC"][0]
         check(btc_val == 100.0, f"BTC Row 0 value correct ({btc_val})")
 
+        # 4. Stacked alignment (single asof scan) must give the same frame
+        stacked_res = self.pipeline.execute_multi_asset(
+            self.data_map, strict=True, anchor="BTC", stack_assets=True
+        )
+        check(
+            stacked_res.is_ok() and stacked_res.unwrap().collect().equals(self.result_df),
+            "stack_assets=True matches per-follower joins"
+        )
+
         return all_passed
 
     def run(self):
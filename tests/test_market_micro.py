@@ -48,7 +48,11 @@ class TestMicroLogic:
             "2. Correlation (Perf)  ": self.test_perfect_correlation,
             "3. Correlation (Neg)   ": self.test_negative_correlation,
             "4. Missing Anchor      ": self.test_missing_anchor,
-            "5. Window Generation   ": self.test_window_generation
+            "5. Window Generation   ": self.test_window_generation,
+            "6. Numba Parity        ": self.test_numba_parity,
+            "7. Moments Parity      ": self.test_moments_parity,
+            "8. Hybrid Corr Parity  ": self.test_hybrid_corr_parity,
+            "9. Schema Preview      ": self.test_schema_preview
         }
         
         passed = 0
@@ -161,6 +165,51 @@ class TestMicroLogic:
         check_15m = "vol_BTC_15m" in cols
         return check_5m and check_15m
 
+    def test_numba_parity(self) -> bool:
+        """JIT backend must reproduce the Polars backend (columns & values)."""
+        return self._backend_matches_polars(use_numba=True)
+
+    def test_moments_parity(self) -> bool:
+        """Precomputed-moments backend must reproduce the Polars backend."""
+        return self._backend_matches_polars(use_moments=True)
+
+    def test_hybrid_corr_parity(self) -> bool:
+        """Polars std + JIT corr for large windows must keep values and column order."""
+        return self._backend_matches_polars(numba_corr_min_rows=60)
+
+    def test_schema_preview(self) -> bool:
+        """preview_schema must equal the plan's schema (with and without the anchor)."""
+        df = self._create_dummy()
+        transformer = create_microstructure_transformer(windows=["5m", "1h"])
+        for lf in (df, df.drop("ret_BTC")):
+            preview = transformer.preview_schema(dict(lf.collect_schema()))
+            if preview.is_err():
+                return False
+            actual = dict(transformer.transform(lf).unwrap().collect_schema())
+            if list(preview.unwrap().items()) != list(actual.items()):
+                logger.warning(f"Preview mismatch: {preview.unwrap()} vs {actual}")
+                return False
+        return transformer.preview_schema({"timestamp": pl.Int64}).is_err()
+
+    def _backend_matches_polars(self, **backend) -> bool:
+        df = self._create_dummy().with_columns(
+            pl.when(pl.int_range(pl.len()) < 3).then(None).otherwise(pl.col("ret_DOGE")).alias("ret_DOGE")
+        )
+        ref = create_microstructure_transformer(windows=["5m", "1h"]).transform(df).unwrap().collect()
+        alt = create_microstructure_transformer(
+            windows=["5m", "1h"], **backend
+        ).transform(df).unwrap().collect()
+        
+        if alt.columns != ref.columns:
+            logger.warning(f"Column mismatch: {alt.columns} vs {ref.columns}")
+            return False
+        
+        feat_cols = [c for c in ref.columns if c.startswith(("vol_", "corr_"))]
+        max_diff = max(
+            (alt[c] - ref[c]).abs().max() for c in feat_cols
+        )
+        return max_diff < 1e-9
+
     def print_summary(self, passed, total):
         print("\n" + "="*50)
         print(f"TIER 2 TEST: {passed}/{total} Passed")
@@ -16,6 +16,7 @@ PROJECT_ROOT = Path(__file__).parent.parent.absolute()
 sys.path.append(str(PROJECT_ROOT))
 
 import polars as pl
+import numpy as np
 
 # Import Target Module
 from research.processing.storage.metadata_registry import create_metadata_registry
@@ -59,7 +60,10 @@ class TestMetadataRegistryLogic:
             ("1. Hash Determinism    ", self.test_hash_determinism),
             ("2. Schema Enforcement  ", self.test_schema_enforcement),
             ("3. Atomic Update       ", self.test_atomic_update),
-            ("4. Consistency Check   ", self.test_consistency_verification)
+            ("4. Consistency Check   ", self.test_consistency_verification),
+            ("5. Deferred Writes     ", self.test_deferred_writes),
+            ("6. Round-Trip Hash     ", self.test_roundtrip_hash),
+            ("7. In-Place Edit Hash  ", self.test_inplace_edit_hash)
         ]
         
         results = []
@@ -188,6 +192,62 @@ class TestMetadataRegistryLogic:
             
         return True, "Consistency logic operational"
 
+    def test_deferred_writes(self) -> Tuple[bool, str]:
+        """Updates inside deferred_writes() reach disk once, on exit, with the latest data."""
+        sub_dir = Path(self.test_dir) / "deferred"
+        registry = create_metadata_registry(str(sub_dir))
+        meta_path = sub_dir / "metadata.json"
+
+        with registry.deferred_writes():
+            registry.update_registry(10, ["col1"], {"asset": "BTC"})
+            registry.update_registry(20, ["col1"], {"asset": "ETH"})
+            if meta_path.exists():
+                return False, "metadata.json written before the batch ended"
+
+        with open(meta_path, 'r') as f:
+            data = json.load(f)
+
+        if data["row_count"] != 20:
+            return False, f"Expected latest update, got row_count={data['row_count']}"
+
+        return True, "Batch coalesced into one write"
+
+    def test_roundtrip_hash(self) -> Tuple[bool, str]:
+        """Params written to disk must hash the same when verified from disk."""
+        sub_dir = Path(self.test_dir) / "roundtrip"
+        registry = create_metadata_registry(str(sub_dir))
+        params = {
+            "threshold": np.float64(0.5),
+            "window": np.int64(60),
+            "start": datetime(2024, 1, 1, 12, 30),
+            "eps": 1e-12,
+        }
+
+        if registry.update_registry(100, ["col1"], params).is_err():
+            return False, "update_registry failed"
+
+        # Fresh instance: no in-memory caches, hash comes from the loaded document
+        res = create_metadata_registry(str(sub_dir)).verify_consistency(params)
+        if res.is_err() or not res.unwrap():
+            return False, f"Loaded params hash differently: {res}"
+
+        return True, "numpy/datetime params survive the write"
+
+    def test_inplace_edit_hash(self) -> Tuple[bool, str]:
+        """Editing a config in place (1 -> 1.0) must not return the old hash."""
+        registry = create_metadata_registry(self.test_dir)
+        config = {"w": 1}
+        old_hash = registry.generate_feature_hash(config)
+
+        config["w"] = 1.0
+        new_hash = registry.generate_feature_hash(config)
+
+        if new_hash == old_hash:
+            return False, "Stale hash returned after in-place edit"
+        if new_hash != registry.generate_feature_hash({"w": 1.0}):
+            return False, "Edited config hashes differently from a fresh equal config"
+        return True, "In-place edits re-hash"
+
     # --- CLI SUMMARY ---
 
     def print_summary(self, results):
@@ -42,7 +42,8 @@ class TestReturnsLogic:
             "1. Basic Math Check     ": self.test_basic_math,
             "2. Zero/Neg Handling    ": self.test_zero_handling,
             "3. Auto Column Detection": self.test_auto_detection,
-            "4. Missing Column Check ": self.test_missing_column
+            "4. Missing Column Check ": self.test_missing_column,
+            "5. Schema Preview       ": self.test_schema_preview
         }
         
         passed = 0
@@ -152,6 +153,23 @@ class TestReturnsLogic:
             return True
         return False
 
+    def test_schema_preview(self) -> bool:
+        """preview_schema must equal the plan's schema (no data touched)."""
+        df = pl.DataFrame({
+            "timestamp": [1, 2],
+            "close_A": [10.0, 11.0],
+            "close_B": [20, 21],
+            "volume": [1000, 1100]
+        }).lazy()
+
+        transformer = create_log_returns_transformer()
+        preview = transformer.preview_schema(dict(df.collect_schema()))
+        if preview.is_err():
+            return False
+        actual = dict(transformer.transform(df).unwrap().collect_schema())
+        no_target = transformer.preview_schema({"timestamp": pl.Int64})
+        return list(preview.unwrap().items()) == list(actual.items()) and no_target.is_err()
+
     def print_summary(self, passed, total):
         print("\n" + "="*50)
         print(f"RETURNS TEST: {passed}/{total} Passed")
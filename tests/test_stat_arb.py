@@ -53,7 +53,15 @@ class TestStatArbLogic:
             ("3. Z-Score Normalization", self.test_zscore_logic),
             ("4. Numerical Stability", self.test_stability_zero_var),
             ("5. Feature Chaining Check", self.test_chaining_success),
-            ("6. Multi-Asset Support  ", self.test_multi_asset_support)
+            ("6. Multi-Asset Support  ", self.test_multi_asset_support),
+            ("7. Collect-All Parity   ", self.test_transform_collect_parity),
+            ("8. Float32 Beta Stage   ", self.test_float32_beta_precision),
+            ("9. Schema Cache Reuse   ", self.test_schema_cache_reuse),
+            ("10. Numba Eager Parity  ", self.test_numba_eager_parity),
+            ("11. Long Window Welford ", self.test_long_window_stability),
+            ("12. Streaming Collect   ", self.test_streaming_collect),
+            ("13. Degenerate Windows  ", self.test_degenerate_windows),
+            ("14. Schema Preview      ", self.test_schema_preview)
         ]
         
         results = []
@@ -194,6 +202,161 @@ class TestStatArbLogic:
             return True, "Handled 2 target assets"
         return False, "Failed to compute multi-asset features"
 
+    def test_transform_collect_parity(self) -> Tuple[bool, str]:
+        """Per-asset collect_all path must match the single lazy plan exactly."""
+        start_date = datetime(2024, 1, 1)
+        ts = [start_date + timedelta(minutes=i) for i in range(300)]
+        df = pl.DataFrame({
+            "timestamp": ts,
+            "log_ETH": np.cumsum(np.random.normal(0, 0.01, 300)),
+            "log_BTC": np.cumsum(np.random.normal(0, 0.01, 300)),
+            "log_DOGE": np.cumsum(np.random.normal(0, 0.01, 300))
+        }).lazy()
+
+        transformer = create_stat_arb_transformer(beta_window="60m", zscore_window="30m")
+        lazy_out = transformer.transform(df).unwrap().collect()
+        res = transformer.transform_collect(df)
+        if res.is_err(): return False, res.error
+
+        eager_out = res.unwrap()
+        if eager_out.columns != lazy_out.columns:
+            return False, f"Column order mismatch: {eager_out.columns}"
+        if not eager_out.equals(lazy_out):
+            return False, "Values differ from lazy transform"
+        return True, f"{eager_out.width} columns identical"
+
+    def test_float32_beta_precision(self) -> Tuple[bool, str]:
+        """Opt-in Float32 beta: close to Float64 and still Float64 on output."""
+        df = self._create_linear_data(n_rows=300, beta=2.0)
+        ref = create_stat_arb_transformer(beta_window="60m").transform(df).unwrap().collect()
+        res = create_stat_arb_transformer(beta_window="60m", use_float32=True).transform(df)
+        if res.is_err(): return False, res.error
+
+        out = res.unwrap().collect()
+        bad_dtypes = [c for c in out.columns if c != "timestamp" and out[c].dtype != pl.Float64]
+        if bad_dtypes:
+            return False, f"Non-Float64 outputs: {bad_dtypes}"
+
+        max_diff = (out["beta_DOGE_BTC"] - ref["beta_DOGE_BTC"]).abs().max()
+        if max_diff < 1e-3:
+            return True, f"Max beta diff: {max_diff:.2e}"
+        return False, f"Float32 beta drifted: {max_diff:.2e}"
+
+    def test_schema_cache_reuse(self) -> Tuple[bool, str]:
+        """A caller-supplied schema_cache must give the same result as inspection."""
+        df = self._create_linear_data(n_rows=150)
+        transformer = create_stat_arb_transformer(beta_window="60m")
+        names = df.collect_schema().names()
+
+        ref = transformer.transform(df).unwrap().collect()
+        cached = transformer.transform(df, schema_cache=names).unwrap().collect()
+        bad = transformer.transform(df, schema_cache=["timestamp", "log_DOGE"])
+
+        if not cached.equals(ref):
+            return False, "Cached schema changed the output"
+        if bad.is_ok():
+            return False, "Stale cache without anchor was accepted"
+        return True, "Cache reused, missing anchor still rejected"
+
+    def test_schema_preview(self) -> Tuple[bool, str]:
+        """preview_schema must equal the plan's schema; a missing anchor is an Err."""
+        df = self._create_linear_data(n_rows=150)
+        transformer = create_stat_arb_transformer(beta_window="60m")
+
+        preview = transformer.preview_schema(dict(df.collect_schema()))
+        if preview.is_err():
+            return False, f"Preview failed: {preview.error}"
+        actual = dict(transformer.transform(df).unwrap().collect_schema())
+        if list(preview.unwrap().items()) != list(actual.items()):
+            return False, f"Preview {preview.unwrap()} != plan {actual}"
+        if transformer.preview_schema({"timestamp": pl.Int64, "log_DOGE": pl.Float64}).is_ok():
+            return False, "Schema without anchor was accepted"
+        return True, "Preview matches the plan"
+
+    def test_numba_eager_parity(self) -> Tuple[bool, str]:
+        """JIT eager path (or its collect_all fallback) must match the lazy plan."""
+        start_date = datetime(2024, 1, 1)
+        ts = [start_date + timedelta(minutes=i) for i in range(400)]
+        df = pl.DataFrame({
+            "timestamp": ts,
+            "log_BTC": 10 + np.cumsum(np.random.normal(0, 0.001, 400)),
+            "log_ETH": 7 + np.cumsum(np.random.normal(0, 0.001, 400)),
+            "log_DOGE": [None] * 5 + list(np.cumsum(np.random.normal(0, 0.002, 395)))
+        })
+
+        transformer = create_stat_arb_transformer(beta_window="60m", zscore_window="30m")
+        ref = transformer.transform(df.lazy()).unwrap().collect()
+        res = transformer.transform_eager_numba(df)
+        if res.is_err(): return False, res.error
+
+        out = res.unwrap()
+        if out.columns != ref.columns:
+            return False, f"Column order mismatch: {out.columns}"
+
+        max_diff = 0.0
+        for col in ref.columns[1:]:
+            if out[col].null_count() != ref[col].null_count():
+                return False, f"Null mask differs on {col}"
+            max_diff = max(max_diff, (out[col] - ref[col]).abs().max() or 0.0)
+
+        # Welford vs Polars' rolling sums: agree to float noise, not bitwise
+        if max_diff < 1e-4:
+            return True, f"Max diff: {max_diff:.2e}"
+        return False, f"Eager path drifted: {max_diff:.2e}"
+
+    def test_long_window_stability(self) -> Tuple[bool, str]:
+        """1w window on low-variance log prices: beta must track a two-pass OLS."""
+        n_rows, window = 12000, 10080
+        rng = np.random.default_rng(7)
+        btc_log = 10 + np.cumsum(rng.normal(0, 1e-5, n_rows))
+        eth_log = 3 + 0.5 * btc_log + rng.normal(0, 1e-5, n_rows)
+        df = pl.DataFrame({"log_BTC": btc_log, "log_ETH": eth_log})
+
+        transformer = create_stat_arb_transformer(beta_window="1w", anchor_symbol="BTC")
+        res = transformer.transform_eager_numba(df)
+        if res.is_err(): return False, res.error
+        beta = res.unwrap()["beta_ETH_BTC"].to_numpy()
+
+        max_err = 0.0
+        for i in range(window - 1, n_rows, 101):
+            x = btc_log[i - window + 1:i + 1]
+            y = eth_log[i - window + 1:i + 1]
+            x_dm = x - x.mean()
+            exact = (x_dm * (y - y.mean())).sum() / (x_dm * x_dm).sum()
+            max_err = max(max_err, abs(beta[i] - exact))
+
+        if (beta[window:] == 0.0).any():
+            return False, "Spurious zero beta (variance cancelled)"
+        if max_err < 1e-5:
+            return True, f"Max err vs two-pass: {max_err:.2e}"
+        return False, f"Beta drifted on long window: {max_err:.2e}"
+
+    def test_streaming_collect(self) -> Tuple[bool, str]:
+        """Streaming engine must materialize the same frame as in-memory collect."""
+        df = self._create_linear_data(n_rows=300)
+        transformer = create_stat_arb_transformer(beta_window="60m", zscore_window="30m")
+        lf = transformer.transform(df).unwrap()
+
+        streamed = transformer.collect_streaming(lf)
+        if streamed.equals(lf.collect()):
+            return True, f"{streamed.height} rows identical"
+        return False, "Streaming result differs"
+
+    def test_degenerate_windows(self) -> Tuple[bool, str]:
+        """1-row windows (< min_periods) must short-circuit to 0.0, not crash."""
+        df = self._create_linear_data(n_rows=50)
+        transformer = create_stat_arb_transformer(beta_window="1m", zscore_window="1m")
+        res = transformer.transform(df)
+        if res.is_err(): return False, res.error
+
+        out = res.unwrap().collect()
+        beta, z = out["beta_DOGE_BTC"], out["z_score_DOGE"]
+        if beta.dtype != pl.Float64 or z.dtype != pl.Float64:
+            return False, f"Wrong dtypes: {beta.dtype}, {z.dtype}"
+        if (beta == 0.0).all() and (z == 0.0).all():
+            return True, "Constant 0.0 without rolling kernels"
+        return False, "Degenerate window produced non-zero features"
+
     # --- CLI SUMMARY ---
 
     def print_summary(self, results: List):
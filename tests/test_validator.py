@@ -49,6 +49,8 @@ class TestValidatorLogic:
             "6. Max Nulls (Fail)   ": self.test_nulls_fail,
             "7. Integrity (Sort)   ": self.test_sorting_fail,
             "8. Integrity (Price)  ": self.test_negative_price,
+            "9. Schema Pre-Verified": self.test_schema_preverified,
+            "10. In-Plan Checks    ": self.test_as_expressions,
         }
         
         passed = 0
@@ -168,6 +170,31 @@ class TestValidatorLogic:
         logger.warning(f"Failed to catch negative price. Got: {res}")
         return False
 
+    def test_schema_preverified(self):
+        # check_schema works on a plain mapping; validate_schema=False skips the plan check
+        validator = PolarsValidator(default_rules=ValidationRules(min_rows=10))
+        bad = validator.check_schema({"timestamp": pl.Utf8, "close": pl.Float64})
+        good = validator.check_schema({"timestamp": pl.Int64, "close": pl.Float64})
+        res = validator.validate(self._create_dummy(rows=20), rules={"validate_schema": False})
+        return bad.is_err() and good.is_ok() and res.is_ok()
+
+    def test_as_expressions(self):
+        # Predicates keep every row on good data and raise at collect on bad data
+        validator = PolarsValidator(default_rules=ValidationRules(min_rows=10))
+        good = self._create_dummy(rows=20)
+        exprs = validator.as_expressions(good.collect_schema()).unwrap()
+        if good.filter(*exprs).collect().height != 20:
+            return False
+
+        bad = self._create_dummy(rows=20, sorted_ts=False)
+        exprs = validator.as_expressions(bad.collect_schema()).unwrap()
+        try:
+            bad.filter(*exprs).collect()
+        except Exception as e:
+            return "not sorted" in str(e)
+        logger.warning("In-plan checks let unsorted data through.")
+        return False
+
     def print_summary(self, passed, total):
         print("\n" + "="*50)
         print(f"VALIDATOR STATUS: {passed}/{total} Scenarios Passed")